@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
-from .zobrist import ZOBRIST, compute_hash_from_scratch
+from .zobrist import (
+    ZOBRIST_CASTLING,
+    ZOBRIST_EP_SQ,
+    ZOBRIST_PIECE,
+    ZOBRIST_STM,
+    compute_hash_from_scratch,
+)
 
-from .move import Move, square_to_str, str_to_square
+from .move import MOVES, PROMOTION_MOVES, PROMOTION_PIECES, Move, square_to_str
 
 
 STARTPOS_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
@@ -13,7 +19,6 @@ STARTPOS_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
 
 # Piece indices for bitboards
 WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK = range(12)
-PIECE_ORDER = [WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK]
 PIECE_TO_CHAR = {
     WP: "P",
     WN: "N",
@@ -29,36 +34,358 @@ PIECE_TO_CHAR = {
     BK: "k",
 }
 CHAR_TO_PIECE = {v: k for k, v in PIECE_TO_CHAR.items()}
+# Piece index per ASCII byte (-1 for non-piece bytes), for byte-level FEN parsing
+PIECE_FROM_BYTE = tuple(CHAR_TO_PIECE.get(chr(c), -1) for c in range(256))
+
+
+def _pawn_attackers_mask(sq: int, white: bool) -> int:
+    """Return the squares from which a pawn of the given colour attacks `sq`."""
+    f = sq & 7
+    origin_rank = (sq >> 3) + (-1 if white else 1)
+    if not 0 <= origin_rank < 8:
+        return 0
+    mask = 0
+    for tf in (f - 1, f + 1):
+        if 0 <= tf < 8:
+            mask |= 1 << (origin_rank * 8 + tf)
+    return mask
+
+
+# Per-square pawn attacker origins: `bb[WP] & WHITE_PAWN_ATTACKERS[sq]` is non-zero iff a
+# white pawn attacks `sq` (likewise for black).
+WHITE_PAWN_ATTACKERS = tuple(_pawn_attackers_mask(sq, True) for sq in range(64))
+BLACK_PAWN_ATTACKERS = tuple(_pawn_attackers_mask(sq, False) for sq in range(64))
+
+KNIGHT_DELTAS = ((-1, 2), (1, 2), (-2, 1), (2, 1), (-2, -1), (2, -1), (-1, -2), (1, -2))
+KING_DELTAS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+def _leaper_mask(sq: int, deltas: Tuple[Tuple[int, int], ...]) -> int:
+    """Return the squares one (df, dr) step away from `sq` that stay on the board."""
+    f = sq & 7
+    r = sq >> 3
+    mask = 0
+    for df, dr in deltas:
+        tf, tr = f + df, r + dr
+        if 0 <= tf < 8 and 0 <= tr < 8:
+            mask |= 1 << (tr * 8 + tf)
+    return mask
+
+
+KNIGHT_ATTACKS = tuple(_leaper_mask(sq, KNIGHT_DELTAS) for sq in range(64))
+KING_ATTACKS = tuple(_leaper_mask(sq, KING_DELTAS) for sq in range(64))
+# Squares a pawn standing on `sq` captures onto
+WHITE_PAWN_CAPTURES = tuple(_leaper_mask(sq, ((-1, 1), (1, 1))) for sq in range(64))
+BLACK_PAWN_CAPTURES = tuple(_leaper_mask(sq, ((-1, -1), (1, -1))) for sq in range(64))
+
+BISHOP_DIRS = ((-1, -1), (1, -1), (-1, 1), (1, 1))
+ROOK_DIRS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _ray_mask(sq: int, dirs: Tuple[Tuple[int, int], ...]) -> int:
+    """Return all squares reachable from `sq` along `dirs` on an empty board."""
+    f = sq & 7
+    r = sq >> 3
+    mask = 0
+    for df, dr in dirs:
+        tf, tr = f + df, r + dr
+        while 0 <= tf < 8 and 0 <= tr < 8:
+            mask |= 1 << (tr * 8 + tf)
+            tf += df
+            tr += dr
+    return mask
+
+
+# Empty-board slider reach per square. The relation is symmetric, so these are also the
+# squares a bishop/rook must stand on to have any chance of attacking `sq`.
+BISHOP_RAYS = tuple(_ray_mask(sq, BISHOP_DIRS) for sq in range(64))
+ROOK_RAYS = tuple(_ray_mask(sq, ROOK_DIRS) for sq in range(64))
+
+# Single-direction rays per square. Along "positive" rays square indices increase, so the
+# nearest blocker is the LS1B of `ray & occ`; along "negative" rays it is the MS1B.
+RAY_N = tuple(_ray_mask(sq, ((0, 1),)) for sq in range(64))
+RAY_E = tuple(_ray_mask(sq, ((1, 0),)) for sq in range(64))
+RAY_NE = tuple(_ray_mask(sq, ((1, 1),)) for sq in range(64))
+RAY_NW = tuple(_ray_mask(sq, ((-1, 1),)) for sq in range(64))
+RAY_S = tuple(_ray_mask(sq, ((0, -1),)) for sq in range(64))
+RAY_W = tuple(_ray_mask(sq, ((-1, 0),)) for sq in range(64))
+RAY_SE = tuple(_ray_mask(sq, ((1, -1),)) for sq in range(64))
+RAY_SW = tuple(_ray_mask(sq, ((-1, -1),)) for sq in range(64))
+
+
+def _line_tables() -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[int, ...], ...]]:
+    """Build BETWEEN and LINE for every aligned square pair (0 when not aligned)."""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for fwd, back in ((RAY_N, RAY_S), (RAY_E, RAY_W), (RAY_NE, RAY_SW), (RAY_NW, RAY_SE)):
+        for a in range(64):
+            full = fwd[a] | back[a] | (1 << a)
+            for rays in (fwd, back):
+                targets = rays[a]
+                while targets:
+                    b_bit = targets & -targets
+                    b = b_bit.bit_length() - 1
+                    between[a][b] = rays[a] & ~rays[b] & ~b_bit
+                    line[a][b] = full
+                    targets ^= b_bit
+    return tuple(map(tuple, between)), tuple(map(tuple, line))
+
+
+# BETWEEN[a][b]: squares strictly between aligned a and b. LINE[a][b]: the whole board
+# line through both (including them). Both are 0 for unaligned pairs.
+BETWEEN, LINE = _line_tables()
+
+BB_ALL = 0xFFFFFFFFFFFFFFFF
+NOT_FILE_A = 0xFEFEFEFEFEFEFEFE
+NOT_FILE_H = 0x7F7F7F7F7F7F7F7F
+RANK_1 = 0x00000000000000FF
+RANK_3 = 0x0000000000FF0000
+RANK_6 = 0x0000FF0000000000
+RANK_8 = 0xFF00000000000000
+# Single-square bitboards: indexing the table is cheaper than building `1 << sq` each time
+SQUARE_BIT = tuple(1 << sq for sq in range(64))
+
+
+def _line_attacks(sq: int, occ: int, pos_rays: Tuple[int, ...], neg_rays: Tuple[int, ...]) -> int:
+    """Return attacks from `sq` along one line (a positive and a negative ray)."""
+    ray = pos_rays[sq]
+    blockers = ray & occ
+    if blockers:
+        ray ^= pos_rays[(blockers & -blockers).bit_length() - 1]
+    attacks = ray
+    ray = neg_rays[sq]
+    blockers = ray & occ
+    if blockers:
+        ray ^= neg_rays[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def _line_table(
+    sq: int, pos_rays: Tuple[int, ...], neg_rays: Tuple[int, ...]
+) -> Tuple[int, Dict[int, int]]:
+    """Return (mask, table) so that `table[occ & mask]` is the line attack set from `sq`.
+
+    The far end of each ray never changes what is attacked, so it is left out of the
+    mask; every subset of the remaining (at most six) squares is enumerated once.
+    """
+    pos, neg = pos_rays[sq], neg_rays[sq]
+    mask = 0
+    if pos:
+        mask |= pos ^ (1 << (pos.bit_length() - 1))
+    if neg:
+        mask |= neg & (neg - 1)
+    table: Dict[int, int] = {}
+    subset = 0
+    while True:
+        table[subset] = _line_attacks(sq, subset, pos_rays, neg_rays)
+        subset = (subset - mask) & mask
+        if not subset:
+            break
+    return mask, table
+
+
+def _slider_table(
+    line1: Tuple[int, Dict[int, int]], line2: Tuple[int, Dict[int, int]]
+) -> Tuple[int, Dict[int, int]]:
+    """Combine the tables of two lines through a square into one (mask, table) pair.
+
+    The two masks are disjoint, so every combined occupancy key is one key from each
+    line table OR-ed together, and so is its attack set.
+    """
+    mask1, table1 = line1
+    mask2, table2 = line2
+    table = {k1 | k2: a1 | a2 for k1, a1 in table1.items() for k2, a2 in table2.items()}
+    return mask1 | mask2, table
+
+
+# Per-square slider lookups: `table[occ & mask]` is the full attack set of a bishop or
+# rook on the square. This is magic bitboards without the magic: the masked occupancy
+# is the dict key directly, so no multipliers or shifts are needed. Built from the
+# per-line tables (at most 64 entries each); the rook tables hold about 100k entries
+# in total, the bishop tables about 5k.
+ROOK_TABLES = tuple(
+    _slider_table(_line_table(sq, RAY_N, RAY_S), _line_table(sq, RAY_E, RAY_W)) for sq in range(64)
+)
+BISHOP_TABLES = tuple(
+    _slider_table(_line_table(sq, RAY_NE, RAY_SW), _line_table(sq, RAY_NW, RAY_SE))
+    for sq in range(64)
+)
+
+
+def bishop_attacks(sq: int, occ: int) -> int:
+    """Return the squares a bishop on `sq` attacks given occupancy `occ`."""
+    mask, table = BISHOP_TABLES[sq]
+    return table[occ & mask]
+
+
+def rook_attacks(sq: int, occ: int) -> int:
+    """Return the squares a rook on `sq` attacks given occupancy `occ`."""
+    mask, table = ROOK_TABLES[sq]
+    return table[occ & mask]
+
+
+# Castling rook relocation keyed by (king piece, king destination): (rook piece, from, to).
+# Only consult after confirming a two-square king move; plain king steps share these targets.
+CASTLE_ROOK_MOVES = {
+    (WK, 6): (WR, 7, 5),
+    (WK, 2): (WR, 0, 3),
+    (BK, 62): (BR, 63, 61),
+    (BK, 58): (BR, 56, 59),
+}
+# Promotion char -> piece index per side
+_PROMO_WHITE = {"q": WQ, "r": WR, "b": WB, "n": WN}
+_PROMO_BLACK = {"q": BQ, "r": BR, "b": BB, "n": BN}
+# Indexed by colour (0 = white, 1 = black; `piece >= BP` for a piece index)
+_PROMO_BY_COLOUR = (_PROMO_WHITE, _PROMO_BLACK)
+
+# Castling path masks: squares that must be empty, and squares the king crosses or lands
+# on that must not be attacked
+WHITE_OO_EMPTY = (1 << 5) | (1 << 6)
+WHITE_OO_SAFE = (1 << 5) | (1 << 6)
+WHITE_OOO_EMPTY = (1 << 1) | (1 << 2) | (1 << 3)
+WHITE_OOO_SAFE = (1 << 2) | (1 << 3)
+BLACK_OO_EMPTY = WHITE_OO_EMPTY << 56
+BLACK_OO_SAFE = WHITE_OO_SAFE << 56
+BLACK_OOO_EMPTY = WHITE_OOO_EMPTY << 56
+BLACK_OOO_SAFE = WHITE_OOO_SAFE << 56
+
+# Castling rights bitmask; bit order matches the KQkq FEN field and ZOBRIST_CASTLING
+CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ = 1, 2, 4, 8
+
+# Castling keyed by (king piece, from, to): (required right, must-be-empty, must-be-safe)
+_CASTLING_PATHS = {
+    (WK, 4, 6): (CASTLE_WK, WHITE_OO_EMPTY, WHITE_OO_SAFE),
+    (WK, 4, 2): (CASTLE_WQ, WHITE_OOO_EMPTY, WHITE_OOO_SAFE),
+    (BK, 60, 62): (CASTLE_BK, BLACK_OO_EMPTY, BLACK_OO_SAFE),
+    (BK, 60, 58): (CASTLE_BQ, BLACK_OOO_EMPTY, BLACK_OOO_SAFE),
+}
+CASTLING_CHARS = (("K", CASTLE_WK), ("Q", CASTLE_WQ), ("k", CASTLE_BK), ("q", CASTLE_BQ))
+# FEN-ordered rights string for every mask value
+CASTLING_STRINGS = tuple(
+    "".join(ch for ch, bit in CASTLING_CHARS if mask & bit) for mask in range(16)
+)
+
+
+# Castling bit per ASCII byte (0 for anything other than KQkq)
+CASTLING_FROM_BYTE = tuple(dict(CASTLING_CHARS).get(chr(c), 0) for c in range(256))
+
+
+# Rights that survive a move touching each square: moving from or capturing on a king or
+# rook home square clears the rights tied to it, so `rights &= KEEP[from] & KEEP[to]`.
+_CASTLING_HOME = {
+    4: CASTLE_WK | CASTLE_WQ,
+    0: CASTLE_WQ,
+    7: CASTLE_WK,
+    60: CASTLE_BK | CASTLE_BQ,
+    56: CASTLE_BQ,
+    63: CASTLE_BK,
+}
+CASTLING_KEEP = tuple(0xF & ~_CASTLING_HOME.get(sq, 0) for sq in range(64))
 
 
-def _set_bit(bb: int, sq: int) -> int:
-    return bb | (1 << sq)
-
-
-def _get_bit(bb: int, sq: int) -> bool:
-    return (bb >> sq) & 1 == 1
+def _castling_to_mask(castling: str) -> int:
+    mask = 0
+    for ch, bit in CASTLING_CHARS:
+        if ch in castling:
+            mask |= bit
+    return mask
 
 
-@dataclass
+@dataclass(init=False, slots=True)
 class Board:
     """Board state with bitboards and FEN I/O.
 
     Notes:
     - Squares are 0..63 (a1=0 .. h8=63), rank-major from white's perspective.
+    - Castling rights are kept as a CASTLE_* bitmask; `castling` exposes the
+      FEN-style string view and accepts one on assignment. The constructor takes
+      either form, so internal callers pass the mask straight through.
     - Core engine remains pure and deterministic.
     """
 
-    # 12 piece bitboards, indexed by constants above
+    # 12 piece bitboards, indexed by constants above. Kept as a plain list: array('Q')
+    # re-boxes a fresh int on every read and measured slower in search, with no native
+    # movegen in the tree to benefit from its buffer.
     bb: List[int]
     side_to_move: str  # 'w' or 'b'
-    castling: str  # subset of 'KQkq' or ''
+    castling_rights: int  # CASTLE_* bitmask
     ep_square: Optional[int]  # square index or None
     halfmove_clock: int
     fullmove_number: int
-    # internal move history for make/unmake (Plan 3)
+    # internal move history for make/unmake (Plan 3). Each entry is a flat tuple of ints
+    # (or None) only: (moved_piece, captured_piece, ep_capture_sq, prev_ep, prev_castling,
+    # prev_halfmove, prev_fullmove, prev_hash). from/to/promotion come from the Move
+    # passed to unmake_move, so no Move or bitboard snapshot is retained. One tuple per
+    # ply is cheaper than parallel per-field lists: a single append/pop and unpack.
     _history: List[Tuple] = field(default_factory=list, repr=False)
     # incremental zobrist hash of current position
     zobrist_hash: int = 0
+    # occupancy per colour and combined, plus a square -> piece index mailbox (-1 when
+    # empty); kept in step by make_move/unmake_move. Code that edits `bb` directly must
+    # call `_refresh_occupancy()` afterwards.
+    occ_white: int = field(default=0, repr=False)
+    occ_black: int = field(default=0, repr=False)
+    occ_all: int = field(default=0, repr=False)
+    mailbox: List[int] = field(default_factory=list, repr=False)
+    # last generate_legal_moves() result as (zobrist_hash, state, moves); reused while the
+    # hash matches, e.g. the search's mate check followed by move ordering, or make/unmake
+    # round trips. `state` holds the fields callers may assign directly (side, en passant,
+    # castling rights), which bypass the hash; direct `bb` edits go through
+    # `_refresh_occupancy()`, which drops the cache.
+    _cached_moves: Optional[Tuple[int, Tuple, Tuple[Move, ...]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        bb: List[int],
+        side_to_move: str,
+        castling: Union[str, int],
+        ep_square: Optional[int],
+        halfmove_clock: int,
+        fullmove_number: int,
+        zobrist_hash: int = 0,
+    ) -> None:
+        self.bb = bb
+        self.side_to_move = side_to_move
+        # Accept either the FEN-style string or an already-built CASTLE_* mask
+        self.castling_rights = (
+            castling if isinstance(castling, int) else _castling_to_mask(castling)
+        )
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self._history = []
+        self.zobrist_hash = zobrist_hash
+        self._refresh_occupancy()
+
+    def _refresh_occupancy(self) -> None:
+        """Recompute the occupancy fields and mailbox from the piece bitboards.
+
+        Also drops the cached move list, since direct `bb` edits bypass the hash.
+        """
+        self._cached_moves = None
+        bb = self.bb
+        self.occ_white = bb[WP] | bb[WN] | bb[WB] | bb[WR] | bb[WQ] | bb[WK]
+        self.occ_black = bb[BP] | bb[BN] | bb[BB] | bb[BR] | bb[BQ] | bb[BK]
+        self.occ_all = self.occ_white | self.occ_black
+        mailbox = [-1] * 64
+        for p, pieces in enumerate(bb):
+            while pieces:
+                lsb = pieces & -pieces
+                mailbox[lsb.bit_length() - 1] = p
+                pieces ^= lsb
+        self.mailbox = mailbox
+
+    @property
+    def castling(self) -> str:
+        """Castling rights as a subset of 'KQkq' (empty when none remain)."""
+        return CASTLING_STRINGS[self.castling_rights]
+
+    @castling.setter
+    def castling(self, value: str) -> None:
+        self.castling_rights = _castling_to_mask(value)
+        self._cached_moves = None
 
     @classmethod
     def startpos(cls) -> "Board":
@@ -72,60 +399,74 @@ class Board:
         if len(parts) != 6:
             raise ValueError("FEN must have 6 fields")
         placement, stm, castling, ep, halfmove, fullmove = parts
+        if not fen.isascii():
+            raise ValueError("FEN must be ASCII")
 
-        # Parse piece placement
-        ranks = placement.split("/")
-        if len(ranks) != 8:
-            raise ValueError("FEN board must have 8 ranks")
+        # Parse piece placement: one pass over the raw bytes, rank 8 first
         bb = [0] * 12
-        for rank_idx, rank in enumerate(ranks[::-1]):  # start from rank 1 (bottom)
-            file_idx = 0
-            for ch in rank:
-                if ch.isdigit():
-                    n = int(ch)
-                    if n < 1 or n > 8:
-                        raise ValueError("invalid empty count in FEN rank")
-                    file_idx += n
-                else:
-                    if ch not in CHAR_TO_PIECE:
-                        raise ValueError(f"invalid piece in FEN: {ch!r}")
-                    if file_idx >= 8:
-                        raise ValueError("too many squares in FEN rank")
-                    sq = rank_idx * 8 + file_idx
-                    p = CHAR_TO_PIECE[ch]
-                    bb[p] = _set_bit(bb[p], sq)
-                    file_idx += 1
-            if file_idx != 8:
-                raise ValueError("rank does not sum to 8 squares in FEN")
+        rank_base = 56
+        file_idx = 0
+        for c in placement.encode("ascii"):
+            if 0x31 <= c <= 0x38:  # '1'..'8'
+                file_idx += c - 0x30
+                if file_idx > 8:
+                    raise ValueError("rank does not sum to 8 squares in FEN")
+            elif c == 0x2F:  # '/'
+                if file_idx != 8:
+                    raise ValueError("rank does not sum to 8 squares in FEN")
+                if rank_base == 0:
+                    raise ValueError("FEN board must have 8 ranks")
+                rank_base -= 8
+                file_idx = 0
+            elif c == 0x30 or c == 0x39:  # '0', '9'
+                raise ValueError("invalid empty count in FEN rank")
+            else:
+                p = PIECE_FROM_BYTE[c]
+                if p < 0:
+                    raise ValueError(f"invalid piece in FEN: {chr(c)!r}")
+                if file_idx >= 8:
+                    raise ValueError("too many squares in FEN rank")
+                bb[p] |= 1 << (rank_base + file_idx)
+                file_idx += 1
+        if rank_base != 0:
+            raise ValueError("FEN board must have 8 ranks")
+        if file_idx != 8:
+            raise ValueError("rank does not sum to 8 squares in FEN")
 
         # Side to move
         if stm not in ("w", "b"):
             raise ValueError("side to move must be 'w' or 'b'")
 
-        # Castling rights
+        # Castling rights, normalized to KQkq order via the rights mask
+        castling_mask = 0
         if castling != "-":
-            for ch in castling:
-                if ch not in "KQkq":
+            for c in castling.encode("ascii"):
+                bit = CASTLING_FROM_BYTE[c]
+                if not bit:
                     raise ValueError("invalid castling rights")
-            # normalize ordering KQkq
-            order = "KQkq"
-            castling = "".join([c for c in order if c in castling])
-        else:
-            castling = ""
+                castling_mask |= bit
 
-        # En passant square
+        # En passant square: file letter then rank digit, on the 6th rank with white to
+        # move or the 3rd with black. The square must be empty with an enemy pawn directly
+        # behind it; make_move relies on that to XOR the victim off `ep_square ^ 8`.
         ep_square: Optional[int]
         if ep == "-":
             ep_square = None
         else:
-            try:
-                ep_square = str_to_square(ep)
-            except ValueError as e:
-                raise ValueError("invalid en passant square") from e
-            rank = ep_square // 8
-            # Optional sanity: ep target must be on rank 2 (index 2) or 5 (index 5) (ranks 3 or 6)
-            if rank not in (2, 5):
+            if len(ep) != 2 or not ("a" <= ep[0] <= "h") or not ("1" <= ep[1] <= "8"):
+                raise ValueError("invalid en passant square")
+            rank = ord(ep[1]) - 0x31
+            if rank != (5 if stm == "w" else 2):
                 raise ValueError("invalid en passant square rank")
+            ep_square = (rank << 3) | (ord(ep[0]) - 0x61)
+            occ = 0
+            for pieces in bb:
+                occ |= pieces
+            if occ & (1 << ep_square):
+                raise ValueError("en passant square is occupied")
+            victim = bb[BP] if stm == "w" else bb[WP]
+            if not victim & (1 << (ep_square ^ 8)):
+                raise ValueError("no pawn to capture en passant")
 
         # Halfmove / fullmove
         try:
@@ -139,7 +480,7 @@ class Board:
         board = cls(
             bb=bb,
             side_to_move=stm,
-            castling=castling,
+            castling=castling_mask,
             ep_square=ep_square,
             halfmove_clock=halfmove_clock,
             fullmove_number=fullmove_number,
@@ -149,14 +490,19 @@ class Board:
         return board
 
     def to_fen(self) -> str:
-        # Piece placement
+        # Piece placement: scatter each bitboard into a square-indexed grid once
+        grid: List[Optional[str]] = [None] * 64
+        for idx, bb in enumerate(self.bb):
+            ch = PIECE_TO_CHAR[idx]
+            while bb:
+                lsb = bb & -bb
+                grid[lsb.bit_length() - 1] = ch
+                bb ^= lsb
         ranks_str: List[str] = []
-        for rank_idx in range(7, -1, -1):  # 7..0 maps to ranks 8..1
+        for base in range(56, -1, -8):  # rank 8 down to rank 1
             run = 0
             row = []
-            for file_idx in range(8):
-                sq = rank_idx * 8 + file_idx
-                ch = self._piece_char_at(sq)
+            for ch in grid[base : base + 8]:
                 if ch is None:
                     run += 1
                 else:
@@ -170,488 +516,509 @@ class Board:
         placement = "/".join(ranks_str)
 
         stm = self.side_to_move
-        castling = self.castling if self.castling else "-"
+        castling = CASTLING_STRINGS[self.castling_rights] or "-"
         ep = square_to_str(self.ep_square) if self.ep_square is not None else "-"
         return f"{placement} {stm} {castling} {ep} {self.halfmove_clock} {self.fullmove_number}"
 
-    def _piece_char_at(self, sq: int) -> Optional[str]:
-        # White pieces first (uppercase), then black
-        for idx in PIECE_ORDER:
-            if _get_bit(self.bb[idx], sq):
-                return PIECE_TO_CHAR[idx]
-        return None
-
     def generate_legal_moves(self) -> List[Move]:
-        """Return pseudo-legal moves (pawns, knights, king) with basic legality.
+        """Return all legal moves for the side to move.
 
-        Scaffolding for Plan 3: generate pawn pushes (single/double, promotions),
-        pawn captures (promotions), knights, and king moves. Applies basic
-        in-check filtering by rejecting moves that leave own king attacked.
-        En passant, castling, and sliders are not implemented yet.
+        The last result is cached against `zobrist_hash` plus the directly assignable
+        state fields; callers get a fresh list they may reorder freely.
         """
-        moves: List[Move] = []
-        PROMOS = ("q", "r", "b", "n")
-
-        # Occupancy helpers
-        occ_all = 0
-        for bb in self.bb:
-            occ_all |= bb
-        occ_white = (
-            self.bb[WP] | self.bb[WN] | self.bb[WB] | self.bb[WR] | self.bb[WQ] | self.bb[WK]
-        )
-        occ_black = (
-            self.bb[BP] | self.bb[BN] | self.bb[BB] | self.bb[BR] | self.bb[BQ] | self.bb[BK]
+        cached = self._cached_moves
+        h = self.zobrist_hash
+        state = (self.side_to_move, self.ep_square, self.castling_rights)
+        if cached is not None and cached[0] == h and cached[1] == state:
+            return list(cached[2])
+        legal = self._generate_moves(captures_only=False)
+        self._cached_moves = (h, state, tuple(legal))
+        return legal
+
+    def generate_legal_captures(self) -> List[Move]:
+        """Return legal captures only (including en passant and capture-promotions).
+
+        Lets quiescence search skip building the quiet moves it would discard.
+        """
+        return self._generate_moves(captures_only=True)
+
+    def count_legal_moves(self) -> int:
+        """Return the number of legal moves without building them.
+
+        Counts the target sets `_generate_moves` walks (same pin and check masks) by
+        popcount, so perft's last ply allocates no move list.
+        """
+        cached = self._cached_moves
+        if (
+            cached is not None
+            and cached[0] == self.zobrist_hash
+            and cached[1] == (self.side_to_move, self.ep_square, self.castling_rights)
+        ):
+            return len(cached[2])
+        bb = self.bb
+        is_white = self.side_to_move == "w"
+        masks = self._legality_masks(is_white)
+        if masks is None:
+            return 0
+        king_sq, attacked, pinned, evasion_mask = masks
+        pin_lines = LINE[king_sq]
+        base = 0 if is_white else BP
+        occ_all = self.occ_all
+        own_occ, enemy_occ = (
+            (self.occ_white, self.occ_black) if is_white else (self.occ_black, self.occ_white)
         )
+        king_targets = ~own_occ & BB_ALL
+        target_mask = king_targets & evasion_mask
+
+        # King steps (legal even in double check)
+        count = (KING_ATTACKS[king_sq] & king_targets & ~attacked).bit_count()
+        if not evasion_mask:
+            return count
+
+        # Pawns: unpinned ones set-wise, each pinned one confined to its own pin line
+        empty = ~occ_all & BB_ALL
+        pawns = bb[WP + base]
+        groups = [(pawns & ~pinned, BB_ALL)]
+        stuck = pawns & pinned
+        while stuck:
+            lsb = stuck & -stuck
+            groups.append((lsb, pin_lines[lsb.bit_length() - 1]))
+            stuck ^= lsb
+        for group, line in groups:
+            mask = evasion_mask & line
+            if is_white:
+                single = (group << 8) & empty
+                double = ((single & RANK_3) << 8) & empty
+                left = ((group & NOT_FILE_A) << 7) & enemy_occ
+                right = ((group & NOT_FILE_H) << 9) & enemy_occ
+                promo_rank = RANK_8
+            else:
+                single = (group >> 8) & empty
+                double = ((single & RANK_6) >> 8) & empty
+                left = ((group & NOT_FILE_A) >> 9) & enemy_occ
+                right = ((group & NOT_FILE_H) >> 7) & enemy_occ
+                promo_rank = RANK_1
+            count += (double & mask).bit_count()
+            for targets in (single & mask, left & mask, right & mask):
+                # Each promotion counts once per piece choice
+                count += targets.bit_count() + 3 * (targets & promo_rank).bit_count()
+
+        # Knights (a pinned knight can never stay on its pin line)
+        knights = bb[WN + base] & ~pinned
+        while knights:
+            lsb = knights & -knights
+            count += (KNIGHT_ATTACKS[lsb.bit_length() - 1] & target_mask).bit_count()
+            knights ^= lsb
+        # Sliders
+        diagonal = bb[WB + base] | bb[WQ + base]
+        orthogonal = bb[WR + base] | bb[WQ + base]
+        sliders = diagonal | orthogonal
+        while sliders:
+            lsb = sliders & -sliders
+            from_sq = lsb.bit_length() - 1
+            targets = 0
+            if lsb & diagonal:
+                targets = bishop_attacks(from_sq, occ_all)
+            if lsb & orthogonal:
+                targets |= rook_attacks(from_sq, occ_all)
+            targets &= target_mask
+            if lsb & pinned:
+                targets &= pin_lines[from_sq]
+            count += targets.bit_count()
+            sliders ^= lsb
+
+        count += self._en_passant_origins(king_sq, is_white).bit_count()
+        return count + len(self._castling_targets(king_sq, attacked, is_white))
+
+    def is_pseudo_legal(self, move: Move) -> bool:
+        """Return True if `move` follows the movement rules for the piece on its origin.
+
+        Ignores whether the own king is left in check (see `is_legal`); castling only
+        checks rights and empty squares here.
+        """
+        from_sq, to_sq = move.from_sq, move.to_sq
+        # Negative indices would wrap silently in the table reads below
+        if not (0 <= from_sq < 64 and 0 <= to_sq < 64):
+            return False
+        piece = self.mailbox[from_sq]
+        if piece < 0:
+            return False
+        is_white = self.side_to_move == "w"
+        if (piece < BP) != is_white:
+            return False
+        to_bit = SQUARE_BIT[to_sq]
+        own = self.occ_white if is_white else self.occ_black
+        if own & to_bit:
+            return False
+        occ = self.occ_all
+
+        if piece == WP or piece == BP:
+            # A known promotion letter is required exactly when the pawn reaches the last rank
+            if to_bit & (RANK_8 if is_white else RANK_1):
+                if move.promotion not in PROMOTION_PIECES:
+                    return False
+            elif move.promotion:
+                return False
+            if is_white:
+                if WHITE_PAWN_ATTACKERS[to_sq] & SQUARE_BIT[from_sq]:
+                    return bool(occ & to_bit) or to_sq == self.ep_square
+                if to_sq == from_sq + 8:
+                    return not occ & to_bit
+                return (
+                    to_sq == from_sq + 16
+                    and 8 <= from_sq < 16
+                    and not occ & (to_bit | SQUARE_BIT[from_sq + 8])
+                )
+            if BLACK_PAWN_ATTACKERS[to_sq] & SQUARE_BIT[from_sq]:
+                return bool(occ & to_bit) or to_sq == self.ep_square
+            if to_sq == from_sq - 8:
+                return not occ & to_bit
+            return (
+                to_sq == from_sq - 16
+                and 48 <= from_sq < 56
+                and not occ & (to_bit | SQUARE_BIT[from_sq - 8])
+            )
+        if move.promotion:
+            return False
+
+        if piece == WN or piece == BN:
+            return bool(KNIGHT_ATTACKS[from_sq] & to_bit)
+        if piece == WB or piece == BB:
+            return bool(bishop_attacks(from_sq, occ) & to_bit)
+        if piece == WR or piece == BR:
+            return bool(rook_attacks(from_sq, occ) & to_bit)
+        if piece == WQ or piece == BQ:
+            return bool((bishop_attacks(from_sq, occ) | rook_attacks(from_sq, occ)) & to_bit)
+        if KING_ATTACKS[from_sq] & to_bit:
+            return True
+        path = _CASTLING_PATHS.get((piece, from_sq, to_sq))
+        return path is not None and bool(self.castling_rights & path[0]) and not occ & path[1]
+
+    def is_legal(self, move: Move) -> bool:
+        """Return True if `move` is legal for the side to move.
+
+        Validates one move without generating the full list: movement rules first, then
+        the same check, pin and king-safety tests the generator applies.
+        """
+        if not self.is_pseudo_legal(move):
+            return False
+        bb = self.bb
+        is_white = self.side_to_move == "w"
+        from_sq, to_sq = move.from_sq, move.to_sq
+        own_king = bb[WK] if is_white else bb[BK]
+        if not own_king:
+            # Matches the generator, which yields no moves without a king to protect
+            return False
+        king_sq = own_king.bit_length() - 1
+        to_bit = SQUARE_BIT[to_sq]
+
+        if from_sq == king_sq:
+            attacked = self._attack_bitmap(by_white=not is_white, occ=self.occ_all ^ own_king)
+            path = _CASTLING_PATHS.get((WK if is_white else BK, from_sq, to_sq))
+            if path is not None:
+                return not attacked & (own_king | path[2])
+            return not attacked & to_bit
+
+        mailbox = self.mailbox
+        if to_sq == self.ep_square and mailbox[from_sq] == (WP if is_white else BP):
+            return not self._en_passant_exposes_king(king_sq, from_sq, to_sq, is_white)
+
+        checkers = self._checkers(king_sq, is_white)
+        if checkers:
+            if checkers & (checkers - 1):
+                return False
+            if not (checkers | BETWEEN[king_sq][checkers.bit_length() - 1]) & to_bit:
+                return False
+        if self._pinned_mask(king_sq, is_white) & SQUARE_BIT[from_sq]:
+            return bool(LINE[from_sq][king_sq] & to_bit)
+        return True
 
-        if self.side_to_move == "w":
-            pawns = self.bb[WP]
-            while pawns:
-                lsb = pawns & -pawns
-                from_sq = lsb.bit_length() - 1
-                file_idx = from_sq % 8
-                rank_idx = from_sq // 8
-
-                # Single push (handle promotions from rank 7 → 8)
-                to_sq = from_sq + 8
-                if to_sq <= 63 and not ((occ_all >> to_sq) & 1):
-                    if rank_idx == 6:  # promotion
-                        for promo in PROMOS:
-                            moves.append(Move(from_sq, to_sq, promotion=promo))
-                    else:
-                        moves.append(Move(from_sq, to_sq))
-                        # Double push from rank 2 (rank_idx == 1)
-                        if rank_idx == 1:
-                            to2 = from_sq + 16
-                            if not ((occ_all >> to2) & 1):
-                                moves.append(Move(from_sq, to2))
-
-                # Captures
-                # Left capture (from White's perspective): +7 if not on file a
-                if file_idx > 0:
-                    cap = from_sq + 7
-                    if cap <= 63 and ((occ_black >> cap) & 1):
-                        if (cap // 8) == 7:
-                            for promo in PROMOS:
-                                moves.append(Move(from_sq, cap, promotion=promo))
-                        else:
-                            moves.append(Move(from_sq, cap))
-                # Right capture: +9 if not on file h
-                if file_idx < 7:
-                    cap = from_sq + 9
-                    if cap <= 63 and ((occ_black >> cap) & 1):
-                        if (cap // 8) == 7:
-                            for promo in PROMOS:
-                                moves.append(Move(from_sq, cap, promotion=promo))
-                        else:
-                            moves.append(Move(from_sq, cap))
-
-                pawns ^= lsb
-            # Knights (no legality filtering yet)
-            knights = self.bb[WN]
+    def _generate_moves(self, captures_only: bool) -> List[Move]:
+        """Generate legal moves; with `captures_only`, restrict targets to enemy pieces."""
+        moves: List[Move] = []
+        # Bound locals for the hot append calls below; moves come from the interned tables
+        append = moves.append
+        extend = moves.extend
+
+        bb = self.bb
+        is_white = self.side_to_move == "w"
+
+        # Occupancy helpers (maintained incrementally by make/unmake)
+        occ_white = self.occ_white
+        occ_black = self.occ_black
+        occ_all = self.occ_all
+
+        masks = self._legality_masks(is_white)
+        if masks is None:
+            # Legality is defined by the own king's safety; without one nothing is generated
+            return moves
+        # Pins and checks are resolved before generation, so every move comes out legal:
+        # a pinned piece keeps to the line through it and the king (LINE is symmetric, so
+        # the king's row holds them all).
+        king_sq, attacked, pinned, evasion_mask = masks
+        pin_lines = LINE[king_sq]
+
+        if is_white:
+            # Squares the king may step to, and those other non-pawn pieces may move to
+            king_targets = occ_black if captures_only else ~occ_white & BB_ALL
+            target_mask = king_targets & evasion_mask
+            # Pawns, generated set-wise: shift the whole pawn bitboard onto its targets and
+            # recover each origin from the shift distance.
+            pawns = bb[WP]
+            empty = ~occ_all & BB_ALL
+            single = 0 if captures_only else (pawns << 8) & empty
+            double = ((single & RANK_3) << 8) & empty & evasion_mask
+            single &= evasion_mask
+            left_caps = ((pawns & NOT_FILE_A) << 7) & occ_black & evasion_mask
+            right_caps = ((pawns & NOT_FILE_H) << 9) & occ_black & evasion_mask
+            for targets, delta in ((single, 8), (left_caps, 7), (right_caps, 9)):
+                promos = targets & RANK_8
+                targets ^= promos
+                while promos:
+                    to_bit = promos & -promos
+                    to_sq = to_bit.bit_length() - 1
+                    extend(PROMOTION_MOVES[(to_sq - delta) << 6 | to_sq])
+                    promos ^= to_bit
+                while targets:
+                    to_bit = targets & -targets
+                    to_sq = to_bit.bit_length() - 1
+                    append(MOVES[to_sq - delta][to_sq])
+                    targets ^= to_bit
+            while double:
+                to_bit = double & -double
+                to_sq = to_bit.bit_length() - 1
+                append(MOVES[to_sq - 16][to_sq])
+                double ^= to_bit
+            if pawns & pinned:
+                # Rare: only pawn moves are in the list yet, so trim pinned pawns' moves here
+                moves[:] = [
+                    m
+                    for m in moves
+                    if not pinned & SQUARE_BIT[m.from_sq]
+                    or pin_lines[m.from_sq] & SQUARE_BIT[m.to_sq]
+                ]
+            # Knights (a pinned knight can never stay on its pin line)
+            knights = bb[WN] & ~pinned
             while knights:
                 lsb = knights & -knights
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, 2),
-                    (1, 2),
-                    (-2, 1),
-                    (2, 1),
-                    (-2, -1),
-                    (2, -1),
-                    (-1, -2),
-                    (1, -2),
-                ):
-                    tf = f + df
-                    tr = r + dr
-                    if 0 <= tf < 8 and 0 <= tr < 8:
-                        to_sq = tr * 8 + tf
-                        if not ((occ_white >> to_sq) & 1):
-                            moves.append(Move(from_sq, to_sq))
+                from_moves = MOVES[from_sq]
+                targets = KNIGHT_ATTACKS[from_sq] & target_mask
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 knights ^= lsb
             # Bishops
-            bishops = self.bb[WB]
+            bishops = bb[WB]
             while bishops:
                 lsb = bishops & -bishops
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_white >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_black >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = bishop_attacks(from_sq, occ_all) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 bishops ^= lsb
             # Rooks
-            rooks = self.bb[WR]
+            rooks = bb[WR]
             while rooks:
                 lsb = rooks & -rooks
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_white >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_black >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = rook_attacks(from_sq, occ_all) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 rooks ^= lsb
             # Queens
-            queens = self.bb[WQ]
+            queens = bb[WQ]
             while queens:
                 lsb = queens & -queens
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, -1),
-                    (1, -1),
-                    (-1, 1),
-                    (1, 1),
-                    (-1, 0),
-                    (1, 0),
-                    (0, -1),
-                    (0, 1),
-                ):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_white >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_black >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = (
+                    bishop_attacks(from_sq, occ_all) | rook_attacks(from_sq, occ_all)
+                ) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 queens ^= lsb
             # En passant captures (destination is ep target)
-            if self.ep_square is not None:
-                ep = self.ep_square
-                ep_file = ep % 8
-                # Origins that could capture onto ep square
-                if ep_file > 0:
-                    o = ep - 9
-                    if o >= 0 and ((self.bb[WP] >> o) & 1):
-                        moves.append(Move(o, ep))
-                if ep_file < 7:
-                    o = ep - 7
-                    if o >= 0 and ((self.bb[WP] >> o) & 1):
-                        moves.append(Move(o, ep))
+            origins = self._en_passant_origins(king_sq, True)
+            while origins:
+                lsb = origins & -origins
+                append(MOVES[lsb.bit_length() - 1][self.ep_square])
+                origins ^= lsb
             # King moves: avoid moving into opponent attacks
-            king_bb = self.bb[WK]
-            if king_bb:
-                from_sq = (king_bb & -king_bb).bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, -1),
-                    (0, -1),
-                    (1, -1),
-                    (-1, 0),
-                    (1, 0),
-                    (-1, 1),
-                    (0, 1),
-                    (1, 1),
-                ):
-                    tf = f + df
-                    tr = r + dr
-                    if 0 <= tf < 8 and 0 <= tr < 8:
-                        to_sq = tr * 8 + tf
-                        if not ((occ_white >> to_sq) & 1):
-                            if not self._is_attacked(to_sq, by_white=False):
-                                moves.append(Move(from_sq, to_sq))
-                # Castling (white)
-                # Precondition: king on e1 (square 4) and not in check
-                if from_sq == 4 and not self._is_attacked(4, by_white=False):
-                    # Kingside: rights K, squares f1(5) and g1(6) empty and not attacked
-                    if (
-                        "K" in self.castling
-                        and not ((occ_all >> 5) & 1)
-                        and not ((occ_all >> 6) & 1)
-                    ):
-                        if not self._is_attacked(5, by_white=False) and not self._is_attacked(
-                            6, by_white=False
-                        ):
-                            moves.append(Move(4, 6))
-                    # Queenside: rights Q, squares d1(3), c1(2), b1(1) empty; d1 and c1 not attacked
-                    if (
-                        "Q" in self.castling
-                        and not ((occ_all >> 3) & 1)
-                        and not ((occ_all >> 2) & 1)
-                        and not ((occ_all >> 1) & 1)
-                    ):
-                        if not self._is_attacked(3, by_white=False) and not self._is_attacked(
-                            2, by_white=False
-                        ):
-                            moves.append(Move(4, 2))
+            from_moves = MOVES[king_sq]
+            targets = KING_ATTACKS[king_sq] & king_targets & ~attacked
+            while targets:
+                to_bit = targets & -targets
+                append(from_moves[to_bit.bit_length() - 1])
+                targets ^= to_bit
+            # Castling (white)
+            if not captures_only:
+                for to_sq in self._castling_targets(king_sq, attacked, True):
+                    append(MOVES[king_sq][to_sq])
         else:
-            pawns = self.bb[BP]
-            while pawns:
-                lsb = pawns & -pawns
-                from_sq = lsb.bit_length() - 1
-                file_idx = from_sq % 8
-                rank_idx = from_sq // 8
-
-                # Single push (handle promotions from rank 2 → 1)
-                to_sq = from_sq - 8
-                if to_sq >= 0 and not ((occ_all >> to_sq) & 1):
-                    if rank_idx == 1:  # promotion
-                        for promo in PROMOS:
-                            moves.append(Move(from_sq, to_sq, promotion=promo))
-                    else:
-                        moves.append(Move(from_sq, to_sq))
-                        # Double push from rank 7 (rank_idx == 6)
-                        if rank_idx == 6:
-                            to2 = from_sq - 16
-                            if not ((occ_all >> to2) & 1):
-                                moves.append(Move(from_sq, to2))
-
-                # Captures
-                # Left capture from Black's perspective: -9 if not on file a
-                if file_idx > 0:
-                    cap = from_sq - 9
-                    if cap >= 0 and ((occ_white >> cap) & 1):
-                        if (cap // 8) == 0:
-                            for promo in PROMOS:
-                                moves.append(Move(from_sq, cap, promotion=promo))
-                        else:
-                            moves.append(Move(from_sq, cap))
-                # Right capture: -7 if not on file h
-                if file_idx < 7:
-                    cap = from_sq - 7
-                    if cap >= 0 and ((occ_white >> cap) & 1):
-                        if (cap // 8) == 0:
-                            for promo in PROMOS:
-                                moves.append(Move(from_sq, cap, promotion=promo))
-                        else:
-                            moves.append(Move(from_sq, cap))
-
-                pawns ^= lsb
-            # Knights (no legality filtering yet)
-            knights = self.bb[BN]
+            king_targets = occ_white if captures_only else ~occ_black & BB_ALL
+            target_mask = king_targets & evasion_mask
+            # Pawns, generated set-wise (mirror of the white block)
+            pawns = bb[BP]
+            empty = ~occ_all & BB_ALL
+            single = 0 if captures_only else (pawns >> 8) & empty
+            double = ((single & RANK_6) >> 8) & empty & evasion_mask
+            single &= evasion_mask
+            left_caps = ((pawns & NOT_FILE_A) >> 9) & occ_white & evasion_mask
+            right_caps = ((pawns & NOT_FILE_H) >> 7) & occ_white & evasion_mask
+            for targets, delta in ((single, -8), (left_caps, -9), (right_caps, -7)):
+                promos = targets & RANK_1
+                targets ^= promos
+                while promos:
+                    to_bit = promos & -promos
+                    to_sq = to_bit.bit_length() - 1
+                    extend(PROMOTION_MOVES[(to_sq - delta) << 6 | to_sq])
+                    promos ^= to_bit
+                while targets:
+                    to_bit = targets & -targets
+                    to_sq = to_bit.bit_length() - 1
+                    append(MOVES[to_sq - delta][to_sq])
+                    targets ^= to_bit
+            while double:
+                to_bit = double & -double
+                to_sq = to_bit.bit_length() - 1
+                append(MOVES[to_sq + 16][to_sq])
+                double ^= to_bit
+            if pawns & pinned:
+                moves[:] = [
+                    m
+                    for m in moves
+                    if not pinned & SQUARE_BIT[m.from_sq]
+                    or pin_lines[m.from_sq] & SQUARE_BIT[m.to_sq]
+                ]
+            # Knights (a pinned knight can never stay on its pin line)
+            knights = bb[BN] & ~pinned
             while knights:
                 lsb = knights & -knights
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, 2),
-                    (1, 2),
-                    (-2, 1),
-                    (2, 1),
-                    (-2, -1),
-                    (2, -1),
-                    (-1, -2),
-                    (1, -2),
-                ):
-                    tf = f + df
-                    tr = r + dr
-                    if 0 <= tf < 8 and 0 <= tr < 8:
-                        to_sq = tr * 8 + tf
-                        if not ((occ_black >> to_sq) & 1):
-                            moves.append(Move(from_sq, to_sq))
+                from_moves = MOVES[from_sq]
+                targets = KNIGHT_ATTACKS[from_sq] & target_mask
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 knights ^= lsb
             # Bishops
-            bishops = self.bb[BB]
+            bishops = bb[BB]
             while bishops:
                 lsb = bishops & -bishops
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_black >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_white >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = bishop_attacks(from_sq, occ_all) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 bishops ^= lsb
             # Rooks
-            rooks = self.bb[BR]
+            rooks = bb[BR]
             while rooks:
                 lsb = rooks & -rooks
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_black >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_white >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = rook_attacks(from_sq, occ_all) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 rooks ^= lsb
             # Queens
-            queens = self.bb[BQ]
+            queens = bb[BQ]
             while queens:
                 lsb = queens & -queens
                 from_sq = lsb.bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, -1),
-                    (1, -1),
-                    (-1, 1),
-                    (1, 1),
-                    (-1, 0),
-                    (1, 0),
-                    (0, -1),
-                    (0, 1),
-                ):
-                    tf, tr = f, r
-                    while True:
-                        tf += df
-                        tr += dr
-                        if not (0 <= tf < 8 and 0 <= tr < 8):
-                            break
-                        to_sq = tr * 8 + tf
-                        if (occ_black >> to_sq) & 1:
-                            break
-                        moves.append(Move(from_sq, to_sq))
-                        if (occ_white >> to_sq) & 1:
-                            break
+                from_moves = MOVES[from_sq]
+                targets = (
+                    bishop_attacks(from_sq, occ_all) | rook_attacks(from_sq, occ_all)
+                ) & target_mask
+                if lsb & pinned:
+                    targets &= pin_lines[from_sq]
+                while targets:
+                    to_bit = targets & -targets
+                    append(from_moves[to_bit.bit_length() - 1])
+                    targets ^= to_bit
                 queens ^= lsb
-            # En passant captures (destination is ep target)
-            if self.ep_square is not None:
-                ep = self.ep_square
-                ep_file = ep % 8
-                if ep_file < 7:
-                    o = ep + 9
-                    if o <= 63 and ((self.bb[BP] >> o) & 1):
-                        moves.append(Move(o, ep))
-                if ep_file > 0:
-                    o = ep + 7
-                    if o <= 63 and ((self.bb[BP] >> o) & 1):
-                        moves.append(Move(o, ep))
+            # En passant captures (destination is ep target), highest origin first
+            origins = self._en_passant_origins(king_sq, False)
+            while origins:
+                from_sq = origins.bit_length() - 1
+                append(MOVES[from_sq][self.ep_square])
+                origins ^= SQUARE_BIT[from_sq]
             # King moves: avoid moving into opponent attacks
-            king_bb = self.bb[BK]
-            if king_bb:
-                from_sq = (king_bb & -king_bb).bit_length() - 1
-                f = from_sq % 8
-                r = from_sq // 8
-                for df, dr in (
-                    (-1, -1),
-                    (0, -1),
-                    (1, -1),
-                    (-1, 0),
-                    (1, 0),
-                    (-1, 1),
-                    (0, 1),
-                    (1, 1),
-                ):
-                    tf = f + df
-                    tr = r + dr
-                    if 0 <= tf < 8 and 0 <= tr < 8:
-                        to_sq = tr * 8 + tf
-                        if not ((occ_black >> to_sq) & 1):
-                            if not self._is_attacked(to_sq, by_white=True):
-                                moves.append(Move(from_sq, to_sq))
-                # Castling (black) if king on e8 (60) and not in check
-                if from_sq == 60 and not self._is_attacked(60, by_white=True):
-                    # Kingside: rights k, squares f8(61), g8(62) empty and not attacked
-                    if (
-                        "k" in self.castling
-                        and not ((occ_all >> 61) & 1)
-                        and not ((occ_all >> 62) & 1)
-                    ):
-                        if not self._is_attacked(61, by_white=True) and not self._is_attacked(
-                            62, by_white=True
-                        ):
-                            moves.append(Move(60, 62))
-                    # Queenside: rights q, squares d8(59), c8(58), b8(57) empty; d8 and c8 not attacked
-                    if (
-                        "q" in self.castling
-                        and not ((occ_all >> 59) & 1)
-                        and not ((occ_all >> 58) & 1)
-                        and not ((occ_all >> 57) & 1)
-                    ):
-                        if not self._is_attacked(59, by_white=True) and not self._is_attacked(
-                            58, by_white=True
-                        ):
-                            moves.append(Move(60, 58))
-
-        # Filter out moves that leave own king in check.
-        legal: List[Move] = []
-        for mv in moves:
-            new_bb = self._apply_pseudo_to_bb(mv)
-            if new_bb is None:
-                continue
-            if self.side_to_move == "w":
-                king_bb = new_bb[WK]
-                if king_bb == 0:
-                    continue
-                king_sq = (king_bb & -king_bb).bit_length() - 1
-                if not self._is_attacked(king_sq, by_white=False, bb=new_bb):
-                    legal.append(mv)
-            else:
-                king_bb = new_bb[BK]
-                if king_bb == 0:
-                    continue
-                king_sq = (king_bb & -king_bb).bit_length() - 1
-                if not self._is_attacked(king_sq, by_white=True, bb=new_bb):
-                    legal.append(mv)
-
-        return legal
+            from_moves = MOVES[king_sq]
+            targets = KING_ATTACKS[king_sq] & king_targets & ~attacked
+            while targets:
+                to_bit = targets & -targets
+                append(from_moves[to_bit.bit_length() - 1])
+                targets ^= to_bit
+            # Castling (black)
+            if not captures_only:
+                for to_sq in self._castling_targets(king_sq, attacked, False):
+                    append(MOVES[king_sq][to_sq])
+
+        return moves
 
     def apply(self, move: Move) -> "Board":
         """Return a new Board with `move` applied if legal.
 
-        - Validates the move against generated legal moves.
+        - Validates the move with `is_legal` (no full move generation).
         - Applies move using in-place mechanics on a cloned board.
         - Keeps the original board unchanged (immutable API surface).
         """
-        legal = self.generate_legal_moves()
-        # Compare by structural equality (from, to, promotion)
-        if not any(
-            (m.from_sq == move.from_sq and m.to_sq == move.to_sq and m.promotion == move.promotion)
-            for m in legal
-        ):
+        if not self.is_legal(move):
             raise ValueError("illegal move")
 
-        # Clone board state
-        new_board = Board(
-            bb=list(self.bb),
-            side_to_move=self.side_to_move,
-            castling=self.castling,
-            ep_square=self.ep_square,
-            halfmove_clock=self.halfmove_clock,
-            fullmove_number=self.fullmove_number,
-        )
-        new_board.zobrist_hash = self.zobrist_hash
-        # Apply move in-place on the clone
+        # Apply move in-place on a clone
+        new_board = self.copy()
         new_board.make_move(move)
         return new_board
 
+    def copy(self) -> "Board":
+        """Return an independent copy of the current position.
+
+        Derived state (occupancy, mailbox, hash) is copied rather than recomputed; the
+        make/unmake history is not carried over, so the copy cannot unmake past moves.
+        """
+        new_board = Board.__new__(Board)
+        new_board.bb = self.bb[:]
+        new_board.side_to_move = self.side_to_move
+        new_board.castling_rights = self.castling_rights
+        new_board.ep_square = self.ep_square
+        new_board.halfmove_clock = self.halfmove_clock
+        new_board.fullmove_number = self.fullmove_number
+        new_board._history = []
+        new_board.zobrist_hash = self.zobrist_hash
+        new_board.occ_white = self.occ_white
+        new_board.occ_black = self.occ_black
+        new_board.occ_all = self.occ_all
+        new_board.mailbox = self.mailbox[:]
+        new_board._cached_moves = self._cached_moves
+        return new_board
+
     # --- Plan 3 scaffolding ---
     def make_move(self, move: Move) -> None:
         """Apply `move` to this board in-place with reversible state.
@@ -660,52 +1027,47 @@ class Board:
         """
         from_sq, to_sq = move.from_sq, move.to_sq
         is_white = self.side_to_move == "w"
-
-        # Determine moved piece type
-        moved_piece = None
-        own_indices = (WP, WN, WB, WR, WQ, WK) if is_white else (BP, BN, BB, BR, BQ, BK)
-        for p in own_indices:
-            if (self.bb[p] >> from_sq) & 1:
-                moved_piece = p
-                break
-        if moved_piece is None:
+        bb = self.bb
+        mailbox = self.mailbox
+        from_bit = SQUARE_BIT[from_sq]
+        to_bit = SQUARE_BIT[to_sq]
+
+        # Determine moved piece type (must belong to the side to move)
+        moved_piece = mailbox[from_sq]
+        if moved_piece < 0 or (moved_piece < BP) != is_white:
             raise ValueError("no piece to move from from_sq")
 
         # Determine capture (including en passant)
         captured_piece = None
         ep_capture_sq: Optional[int] = None
-        if moved_piece in (WP, BP) and self.ep_square is not None and to_sq == self.ep_square:
-            # en passant
-            if is_white and (to_sq - from_sq) in (7, 9):
-                ep_capture_sq = to_sq - 8
-                captured_piece = BP
-            elif (not is_white) and (from_sq - to_sq) in (7, 9):
-                ep_capture_sq = to_sq + 8
-                captured_piece = WP
-        else:
-            # normal capture: detect which opponent piece is on to_sq
-            opp_indices = (BP, BN, BB, BR, BQ, BK) if is_white else (WP, WN, WB, WR, WQ, WK)
-            for p in opp_indices:
-                if (self.bb[p] >> to_sq) & 1:
-                    captured_piece = p
-                    break
+        prev_ep = self.ep_square
+        if (moved_piece == WP or moved_piece == BP) and to_sq == prev_ep:
+            # en passant: a pawn can only reach the ep square by capturing onto it. The
+            # captured pawn sits one rank towards the mover (ep squares are on ranks 3/6,
+            # so flipping bit 3 of the index steps to rank 4/5 for either colour).
+            ep_capture_sq = to_sq ^ 8
+            captured_piece = BP - moved_piece  # WP <-> BP
+        elif (self.occ_black if is_white else self.occ_white) & to_bit:
+            captured_piece = mailbox[to_sq]
 
         # Save previous state for unmake
-        prev_state = (
-            move,
-            moved_piece,
-            captured_piece,
-            ep_capture_sq,
-            self.ep_square,
-            self.castling,
-            self.halfmove_clock,
-            self.fullmove_number,
-            self.zobrist_hash,
+        prev_castling = self.castling_rights
+        h = self.zobrist_hash
+        self._history.append(
+            (
+                moved_piece,
+                captured_piece,
+                ep_capture_sq,
+                prev_ep,
+                prev_castling,
+                self.halfmove_clock,
+                self.fullmove_number,
+                h,
+            )
         )
-        self._history.append(prev_state)
 
         # Update halfmove clock
-        if moved_piece in (WP, BP) or captured_piece is not None:
+        if moved_piece == WP or moved_piece == BP or captured_piece is not None:
             self.halfmove_clock = 0
         else:
             self.halfmove_clock += 1
@@ -714,131 +1076,89 @@ class Board:
         if not is_white:
             self.fullmove_number += 1
 
-        # Save previous state for hash toggles
-        prev_castling = self.castling
-        prev_ep = self.ep_square
-
-        # Update castling rights if king or rook moves/captured
-        self._update_castling_rights_on_move(moved_piece, from_sq, to_sq, captured_piece)
+        # Update castling rights: anything leaving or landing on a king/rook home square
+        if prev_castling:
+            rights = prev_castling & CASTLING_KEEP[from_sq] & CASTLING_KEEP[to_sq]
+            if rights != prev_castling:
+                self.castling_rights = rights
+                h ^= ZOBRIST_CASTLING[prev_castling ^ rights]
 
         # Clear en passant by default; set only on double pawn pushes
-        self.ep_square = None
+        ep_square = None
+        if prev_ep is not None:
+            h ^= ZOBRIST_EP_SQ[prev_ep]
 
-        # Bitboard updates: move piece, handle captures and promotion/en passant
-        # Clear from square on moved piece
-        self.bb[moved_piece] &= ~(1 << from_sq)
+        # Bitboard and hash updates in one pass: every square touched is known to flip,
+        # so XOR throughout
+        keys = ZOBRIST_PIECE[moved_piece]
+        h ^= keys[from_sq]
+        own_flip = from_bit | to_bit
+        cap_bit = 0
 
         # Remove captured piece
         if captured_piece is not None:
-            if ep_capture_sq is not None:
-                self.bb[captured_piece] &= ~(1 << ep_capture_sq)
-            else:
-                self.bb[captured_piece] &= ~(1 << to_sq)
-
-        # Place moved piece (or promoted piece); handle castling rook move
-        if moved_piece == WP:
-            if move.promotion:
-                promo_map = {"q": WQ, "r": WR, "b": WB, "n": WN}
-                self.bb[promo_map[move.promotion]] |= 1 << to_sq
+            if ep_capture_sq is None:
+                cap_bit = to_bit
+                h ^= ZOBRIST_PIECE[captured_piece][to_sq]
             else:
-                self.bb[WP] |= 1 << to_sq
-                # Double push sets ep target
-                if to_sq - from_sq == 16:
-                    self.ep_square = from_sq + 8
-        elif moved_piece == BP:
-            if move.promotion:
-                promo_map = {"q": BQ, "r": BR, "b": BB, "n": BN}
-                self.bb[promo_map[move.promotion]] |= 1 << to_sq
-            else:
-                self.bb[BP] |= 1 << to_sq
-                if from_sq - to_sq == 16:
-                    self.ep_square = from_sq - 8
+                cap_bit = SQUARE_BIT[ep_capture_sq]
+                h ^= ZOBRIST_PIECE[captured_piece][ep_capture_sq]
+                mailbox[ep_capture_sq] = -1
+            bb[captured_piece] ^= cap_bit
+        mailbox[from_sq] = -1
+
+        # Move piece (or swap in the promoted piece); handle castling rook move
+        if move.promotion:
+            promo_piece = _PROMO_BY_COLOUR[moved_piece >= BP][move.promotion]
+            bb[moved_piece] ^= from_bit
+            bb[promo_piece] ^= to_bit
+            h ^= ZOBRIST_PIECE[promo_piece][to_sq]
+            mailbox[to_sq] = promo_piece
         else:
-            # King including castling rook movement
-            if moved_piece == WK and abs(to_sq - from_sq) == 2:
-                # Move rook as well
-                if to_sq == 6:  # e1->g1, h1->f1
-                    self.bb[WR] &= ~(1 << 7)
-                    self.bb[WR] |= 1 << 5
-                else:  # e1->c1, a1->d1
-                    self.bb[WR] &= ~(1 << 0)
-                    self.bb[WR] |= 1 << 3
-            elif moved_piece == BK and abs(to_sq - from_sq) == 2:
-                if to_sq == 62:  # e8->g8, h8->f8
-                    self.bb[BR] &= ~(1 << 63)
-                    self.bb[BR] |= 1 << 61
-                else:  # e8->c8, a8->d8
-                    self.bb[BR] &= ~(1 << 56)
-                    self.bb[BR] |= 1 << 59
-            self.bb[moved_piece] |= 1 << to_sq
-
-        # Zobrist hash incremental update
-        h = self.zobrist_hash
-        # Remove previous EP
-        if prev_ep is not None:
-            h ^= ZOBRIST.ep_file[prev_ep % 8]
-        # Piece-square toggles
-        h ^= ZOBRIST.piece_square[moved_piece][from_sq]
-        # Remove captured piece
-        if captured_piece is not None:
-            cap_sq = ep_capture_sq if ep_capture_sq is not None else to_sq
-            h ^= ZOBRIST.piece_square[captured_piece][cap_sq]
-        # Place moved/promotion and handle rook movement in castling
-        if moved_piece == WP and move.promotion:
-            promo_map = {"q": WQ, "r": WR, "b": WB, "n": WN}
-            h ^= ZOBRIST.piece_square[promo_map[move.promotion]][to_sq]
-        elif moved_piece == BP and move.promotion:
-            promo_map = {"q": BQ, "r": BR, "b": BB, "n": BN}
-            h ^= ZOBRIST.piece_square[promo_map[move.promotion]][to_sq]
+            bb[moved_piece] ^= own_flip
+            h ^= keys[to_sq]
+            mailbox[to_sq] = moved_piece
+            if moved_piece == WP or moved_piece == BP:
+                # Double push (either colour) sets the ep target midway between
+                if (from_sq ^ to_sq) == 16:
+                    ep_square = (from_sq + to_sq) >> 1
+                    h ^= ZOBRIST_EP_SQ[ep_square]
+            elif (moved_piece == WK or moved_piece == BK) and abs(to_sq - from_sq) == 2:
+                rook, rook_from, rook_to = CASTLE_ROOK_MOVES[(moved_piece, to_sq)]
+                rook_flip = SQUARE_BIT[rook_from] | SQUARE_BIT[rook_to]
+                bb[rook] ^= rook_flip
+                own_flip |= rook_flip
+                mailbox[rook_from] = -1
+                mailbox[rook_to] = rook
+                rook_keys = ZOBRIST_PIECE[rook]
+                h ^= rook_keys[rook_from] ^ rook_keys[rook_to]
+
+        # Occupancy follows the same flips
+        if is_white:
+            self.occ_white ^= own_flip
+            self.occ_black ^= cap_bit
         else:
-            h ^= ZOBRIST.piece_square[moved_piece][to_sq]
-            if moved_piece == WK and abs(to_sq - from_sq) == 2:
-                if to_sq == 6:  # white kingside
-                    h ^= ZOBRIST.piece_square[WR][7]
-                    h ^= ZOBRIST.piece_square[WR][5]
-                else:  # white queenside
-                    h ^= ZOBRIST.piece_square[WR][0]
-                    h ^= ZOBRIST.piece_square[WR][3]
-            elif moved_piece == BK and abs(to_sq - from_sq) == 2:
-                if to_sq == 62:  # black kingside
-                    h ^= ZOBRIST.piece_square[BR][63]
-                    h ^= ZOBRIST.piece_square[BR][61]
-                else:  # black queenside
-                    h ^= ZOBRIST.piece_square[BR][56]
-                    h ^= ZOBRIST.piece_square[BR][59]
-
-        # Add new EP if any
-        if self.ep_square is not None:
-            h ^= ZOBRIST.ep_file[self.ep_square % 8]
-
-        # Castling rights toggles: out old, in new
-        order = "KQkq"
-        for i, ch in enumerate(order):
-            if ch in prev_castling:
-                h ^= ZOBRIST.castling[i]
-        for i, ch in enumerate(order):
-            if ch in self.castling:
-                h ^= ZOBRIST.castling[i]
-
-        # Toggle side to move
-        h ^= ZOBRIST.side_to_move
-
-        self.zobrist_hash = h & 0xFFFFFFFFFFFFFFFF
-
-        # Toggle side to move (state)
+            self.occ_black ^= own_flip
+            self.occ_white ^= cap_bit
+        self.occ_all = self.occ_white | self.occ_black
+
+        self.ep_square = ep_square
+
+        # Toggle side to move (hash and state)
+        self.zobrist_hash = h ^ ZOBRIST_STM
         self.side_to_move = "b" if is_white else "w"
 
     def unmake_move(self, move: Move) -> None:
         """Undo the last move in-place, restoring previous state.
 
-        Scaffolding stub for Plan 3. Requires a move/state stack to restore:
-        - moved/captured/promoted pieces, castling rights, ep square, counters
-        - hash and any incremental caches
+        `move` must be the move passed to the matching `make_move`; the history entry
+        only stores scalar state (see `_history`) and takes squares from `move`.
+        Restores moved/captured/promoted pieces, castling rights, ep square,
+        counters and the hash.
         """
         if not self._history:
             raise ValueError("no move to unmake")
         (
-            _mv,
             moved_piece,
             captured_piece,
             ep_capture_sq,
@@ -856,315 +1176,288 @@ class Board:
 
         # Restore counters and rights
         self.ep_square = prev_ep
-        self.castling = prev_castling
+        self.castling_rights = prev_castling
         self.halfmove_clock = prev_halfmove
         self.fullmove_number = prev_fullmove
         self.zobrist_hash = prev_hash
 
-        # Undo piece placement
-        # Remove piece from destination (or promoted piece) and place back on from_sq
-        if moved_piece == WP:
-            if move.promotion:
-                promo_map = {"q": WQ, "r": WR, "b": WB, "n": WN}
-                self.bb[promo_map[move.promotion]] &= ~(1 << to_sq)
-                self.bb[WP] |= 1 << from_sq
-            else:
-                self.bb[WP] &= ~(1 << to_sq)
-                self.bb[WP] |= 1 << from_sq
-        elif moved_piece == BP:
-            if move.promotion:
-                promo_map = {"q": BQ, "r": BR, "b": BB, "n": BN}
-                self.bb[promo_map[move.promotion]] &= ~(1 << to_sq)
-                self.bb[BP] |= 1 << from_sq
-            else:
-                self.bb[BP] &= ~(1 << to_sq)
-                self.bb[BP] |= 1 << from_sq
+        # Undo piece placement: the same XOR masks as make_move flip every square back
+        bb = self.bb
+        mailbox = self.mailbox
+        from_bit = SQUARE_BIT[from_sq]
+        to_bit = SQUARE_BIT[to_sq]
+        own_flip = from_bit | to_bit
+        mailbox[from_sq] = moved_piece
+        mailbox[to_sq] = -1
+        if move.promotion:
+            bb[_PROMO_BY_COLOUR[moved_piece >= BP][move.promotion]] ^= to_bit
+            bb[moved_piece] ^= from_bit
         else:
+            bb[moved_piece] ^= own_flip
             # Handle castling rook rollback
-            if moved_piece == WK and abs(to_sq - from_sq) == 2:
-                if to_sq == 6:  # undo rook f1->h1
-                    self.bb[WR] &= ~(1 << 5)
-                    self.bb[WR] |= 1 << 7
-                else:  # to_sq == 2: undo rook d1->a1
-                    self.bb[WR] &= ~(1 << 3)
-                    self.bb[WR] |= 1 << 0
-            elif moved_piece == BK and abs(to_sq - from_sq) == 2:
-                if to_sq == 62:  # undo rook f8->h8
-                    self.bb[BR] &= ~(1 << 61)
-                    self.bb[BR] |= 1 << 63
-                else:  # to_sq == 58: undo rook d8->a8
-                    self.bb[BR] &= ~(1 << 59)
-                    self.bb[BR] |= 1 << 56
-            self.bb[moved_piece] &= ~(1 << to_sq)
-            self.bb[moved_piece] |= 1 << from_sq
+            if (moved_piece == WK or moved_piece == BK) and abs(to_sq - from_sq) == 2:
+                rook, rook_from, rook_to = CASTLE_ROOK_MOVES[(moved_piece, to_sq)]
+                rook_flip = SQUARE_BIT[rook_from] | SQUARE_BIT[rook_to]
+                bb[rook] ^= rook_flip
+                own_flip |= rook_flip
+                mailbox[rook_to] = -1
+                mailbox[rook_from] = rook
 
         # Restore captured piece
+        cap_bit = 0
         if captured_piece is not None:
-            if ep_capture_sq is not None:
-                self.bb[captured_piece] |= 1 << ep_capture_sq
+            if ep_capture_sq is None:
+                cap_bit = to_bit
+                mailbox[to_sq] = captured_piece
             else:
-                self.bb[captured_piece] |= 1 << to_sq
+                cap_bit = SQUARE_BIT[ep_capture_sq]
+                mailbox[ep_capture_sq] = captured_piece
+            bb[captured_piece] ^= cap_bit
 
-    def _update_castling_rights_on_move(
-        self, moved_piece: int, from_sq: int, to_sq: int, captured_piece: Optional[int]
-    ) -> None:
-        """Update castling string based on king/rook moves and rook captures."""
-        rights = set(self.castling)
-        # White king/rook moves
-        if moved_piece == WK:
-            rights.discard("K")
-            rights.discard("Q")
-        elif moved_piece == WR:
-            if from_sq == 0:
-                rights.discard("Q")
-            elif from_sq == 7:
-                rights.discard("K")
-        # Black king/rook moves
-        if moved_piece == BK:
-            rights.discard("k")
-            rights.discard("q")
-        elif moved_piece == BR:
-            if from_sq == 56:
-                rights.discard("q")
-            elif from_sq == 63:
-                rights.discard("k")
-        # Rook captured on original squares
-        if captured_piece == WR and to_sq in (0, 7):
-            if to_sq == 0:
-                rights.discard("Q")
-            else:
-                rights.discard("K")
-        if captured_piece == BR and to_sq in (56, 63):
-            if to_sq == 56:
-                rights.discard("q")
-            else:
-                rights.discard("k")
-        self.castling = "".join(c for c in "KQkq" if c in rights)
+        if moved_piece < BP:
+            self.occ_white ^= own_flip
+            self.occ_black ^= cap_bit
+        else:
+            self.occ_black ^= own_flip
+            self.occ_white ^= cap_bit
+        self.occ_all = self.occ_white | self.occ_black
+
+    def make_null_move(self) -> Optional[int]:
+        """Pass the turn without moving a piece; return the cleared en passant square.
+
+        Used by null-move pruning. The hash is updated incrementally (side to move and
+        en passant file only); undo with `unmake_null_move(prev_ep)`.
+        """
+        prev_ep = self.ep_square
+        h = self.zobrist_hash ^ ZOBRIST_STM
+        if prev_ep is not None:
+            h ^= ZOBRIST_EP_SQ[prev_ep]
+        self.zobrist_hash = h
+        self.ep_square = None
+        self.side_to_move = "b" if self.side_to_move == "w" else "w"
+        return prev_ep
+
+    def unmake_null_move(self, prev_ep: Optional[int]) -> None:
+        """Undo `make_null_move`, restoring the en passant square it returned."""
+        h = self.zobrist_hash ^ ZOBRIST_STM
+        if prev_ep is not None:
+            h ^= ZOBRIST_EP_SQ[prev_ep]
+        self.zobrist_hash = h
+        self.ep_square = prev_ep
+        self.side_to_move = "b" if self.side_to_move == "w" else "w"
 
     # --- Attack and simulation helpers (scaffolding) ---
-    def _is_attacked(self, sq: int, *, by_white: bool, bb: Optional[List[int]] = None) -> bool:
-        """Return True if square `sq` is attacked by given side on board `bb`.
+    def _legality_masks(self, white: bool) -> Optional[Tuple[int, int, int, int]]:
+        """Return `(king_sq, attacked, pinned, evasion_mask)` for `white`, or None without a king.
 
-        Covers: pawns, knights, king, and slider rays for bishops/rooks/queens.
+        `attacked` holds enemy attacks with the king lifted off the board, so stepping back
+        along a checking ray is seen as attacked too. In single check non-king moves must
+        land in `evasion_mask` (the checker or a square between it and the king); in double
+        check it is empty. Shared by `_generate_moves` and `count_legal_moves`.
         """
-        if bb is None:
-            bb = self.bb
+        own_king = self.bb[WK] if white else self.bb[BK]
+        if not own_king:
+            return None
+        king_sq = own_king.bit_length() - 1
+        attacked = self._attack_bitmap(by_white=not white, occ=self.occ_all ^ own_king)
+        pinned = self._pinned_mask(king_sq, white)
+        evasion_mask = BB_ALL
+        if attacked & own_king:
+            checkers = self._checkers(king_sq, white)
+            if checkers & (checkers - 1):
+                evasion_mask = 0
+            else:
+                evasion_mask = checkers | BETWEEN[king_sq][checkers.bit_length() - 1]
+        return king_sq, attacked, pinned, evasion_mask
 
-        # Pawn attacks
-        f = sq % 8
-        r = sq // 8
-        if by_white:
-            # White pawns attack +7 and +9
-            if f > 0:
-                o = sq - 9
-                if o >= 0 and ((bb[WP] >> o) & 1):
-                    return True
-            if f < 7:
-                o = sq - 7
-                if o >= 0 and ((bb[WP] >> o) & 1):
-                    return True
-        else:
-            # Black pawns attack -7 and -9 relative to white's perspective
-            if f < 7:
-                o = sq + 9
-                if o <= 63 and ((bb[BP] >> o) & 1):
-                    return True
-            if f > 0:
-                o = sq + 7
-                if o <= 63 and ((bb[BP] >> o) & 1):
-                    return True
-
-        # Knight attacks
-        for df, dr in ((-1, 2), (1, 2), (-2, 1), (2, 1), (-2, -1), (2, -1), (-1, -2), (1, -2)):
-            tf = f + df
-            tr = r + dr
-            if 0 <= tf < 8 and 0 <= tr < 8:
-                o = tr * 8 + tf
-                if by_white:
-                    if (bb[WN] >> o) & 1:
-                        return True
-                else:
-                    if (bb[BN] >> o) & 1:
-                        return True
-
-        # King attacks
-        for df, dr in ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
-            tf = f + df
-            tr = r + dr
-            if 0 <= tf < 8 and 0 <= tr < 8:
-                o = tr * 8 + tf
-                if by_white:
-                    if (bb[WK] >> o) & 1:
-                        return True
-                else:
-                    if (bb[BK] >> o) & 1:
-                        return True
-
-        # Slider attacks (bishop/rook/queen)
-        occ = 0
-        for b in bb:
-            occ |= b
-
-        # Bishop-like directions
-        for df, dr in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
-            tf, tr = f, r
-            while True:
-                tf += df
-                tr += dr
-                if not (0 <= tf < 8 and 0 <= tr < 8):
-                    break
-                o = tr * 8 + tf
-                if (occ >> o) & 1:
-                    if by_white:
-                        if ((bb[WB] >> o) & 1) or ((bb[WQ] >> o) & 1):
-                            return True
-                    else:
-                        if ((bb[BB] >> o) & 1) or ((bb[BQ] >> o) & 1):
-                            return True
-                    break
-
-        # Rook-like directions
-        for df, dr in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-            tf, tr = f, r
-            while True:
-                tf += df
-                tr += dr
-                if not (0 <= tf < 8 and 0 <= tr < 8):
-                    break
-                o = tr * 8 + tf
-                if (occ >> o) & 1:
-                    if by_white:
-                        if ((bb[WR] >> o) & 1) or ((bb[WQ] >> o) & 1):
-                            return True
-                    else:
-                        if ((bb[BR] >> o) & 1) or ((bb[BQ] >> o) & 1):
-                            return True
-                    break
+    def _en_passant_origins(self, king_sq: int, white: bool) -> int:
+        """Return a bitboard of `white`'s pawns that may legally capture en passant.
 
-        return False
+        The capture removes a second piece from the king's lines (and may take the
+        checker), so each origin gets its own test instead of the pin and check masks.
+        """
+        ep = self.ep_square
+        if ep is None:
+            return 0
+        if white:
+            origins = self.bb[WP] & WHITE_PAWN_ATTACKERS[ep]
+        else:
+            origins = self.bb[BP] & BLACK_PAWN_ATTACKERS[ep]
+        legal = 0
+        while origins:
+            lsb = origins & -origins
+            if not self._en_passant_exposes_king(king_sq, lsb.bit_length() - 1, ep, white):
+                legal |= lsb
+            origins ^= lsb
+        return legal
 
-    def _apply_pseudo_to_bb(self, move: Move) -> Optional[List[int]]:
-        """Apply a simple move to a copy of bitboards; return new bitboards.
+    def _castling_targets(self, king_sq: int, attacked: int, white: bool) -> List[int]:
+        """Return the king destinations of `white`'s legal castling moves, kingside first.
 
-        Supports: pawns (incl. promotions and en passant), knights, king,
-        bishops, rooks, and queens.
+        The king must be on its home square and not in check, the path empty and the
+        squares it crosses unattacked.
         """
-        from_sq, to_sq = move.from_sq, move.to_sq
-        is_white = self.side_to_move == "w"
-        bb = list(self.bb)
+        king = WK if white else BK
+        if attacked & SQUARE_BIT[king_sq]:
+            return []
+        rights = self.castling_rights
+        occ = self.occ_all
+        return [
+            to_sq
+            for (piece, from_sq, to_sq), (right, empty_mask, safe_mask) in _CASTLING_PATHS.items()
+            if piece == king
+            and from_sq == king_sq
+            and rights & right
+            and not occ & empty_mask
+            and not attacked & safe_mask
+        ]
+
+    def _checkers(self, king_sq: int, white: bool) -> int:
+        """Return a bitboard of enemy pieces giving check to `white`'s king on `king_sq`."""
+        bb = self.bb
+        occ = self.occ_all
+        if white:
+            pawns = bb[BP] & BLACK_PAWN_ATTACKERS[king_sq]
+            knights = bb[BN]
+            diag = bb[BB] | bb[BQ]
+            ortho = bb[BR] | bb[BQ]
+        else:
+            pawns = bb[WP] & WHITE_PAWN_ATTACKERS[king_sq]
+            knights = bb[WN]
+            diag = bb[WB] | bb[WQ]
+            ortho = bb[WR] | bb[WQ]
+        return (
+            pawns
+            | (knights & KNIGHT_ATTACKS[king_sq])
+            | (diag & bishop_attacks(king_sq, occ))
+            | (ortho & rook_attacks(king_sq, occ))
+        )
 
-        # Remove destination piece if any (capture)
-        mask_to = ~(1 << to_sq)
-        if is_white:
-            bb[BP] &= mask_to
-            bb[BN] &= mask_to
-            bb[BB] &= mask_to
-            bb[BR] &= mask_to
-            bb[BQ] &= mask_to
-            bb[BK] &= mask_to
+    def _pinned_mask(self, king_sq: int, white: bool) -> int:
+        """Return a bitboard of `white`'s pieces pinned to the king on `king_sq`."""
+        bb = self.bb
+        if white:
+            own = self.occ_white
+            diag = bb[BB] | bb[BQ]
+            ortho = bb[BR] | bb[BQ]
         else:
-            bb[WP] &= mask_to
-            bb[WN] &= mask_to
-            bb[WB] &= mask_to
-            bb[WR] &= mask_to
-            bb[WQ] &= mask_to
-            bb[WK] &= mask_to
-
-        moved = False
-        if is_white:
-            if (bb[WP] >> from_sq) & 1:
-                bb[WP] &= ~(1 << from_sq)
-                # En passant capture (destination equals ep target): remove pawn behind target
-                if (
-                    self.ep_square is not None
-                    and to_sq == self.ep_square
-                    and (to_sq - from_sq) in (7, 9)
-                ):
-                    cap_sq = to_sq - 8
-                    bb[BP] &= ~(1 << cap_sq)
-                if move.promotion:
-                    promo_map = {"q": WQ, "r": WR, "b": WB, "n": WN}
-                    bb[promo_map[move.promotion]] |= 1 << to_sq
-                else:
-                    bb[WP] |= 1 << to_sq
-                moved = True
-            elif (bb[WN] >> from_sq) & 1:
-                bb[WN] &= ~(1 << from_sq)
-                bb[WN] |= 1 << to_sq
-                moved = True
-            elif (bb[WK] >> from_sq) & 1:
-                bb[WK] &= ~(1 << from_sq)
-                bb[WK] |= 1 << to_sq
-                # Handle rook relocation for castling in simulation
-                if abs(to_sq - from_sq) == 2:
-                    if to_sq == 6:  # white kingside e1->g1, rook h1->f1
-                        bb[WR] &= ~(1 << 7)
-                        bb[WR] |= 1 << 5
-                    elif to_sq == 2:  # white queenside e1->c1, rook a1->d1
-                        bb[WR] &= ~(1 << 0)
-                        bb[WR] |= 1 << 3
-                moved = True
-            elif (bb[WB] >> from_sq) & 1:
-                bb[WB] &= ~(1 << from_sq)
-                bb[WB] |= 1 << to_sq
-                moved = True
-            elif (bb[WR] >> from_sq) & 1:
-                bb[WR] &= ~(1 << from_sq)
-                bb[WR] |= 1 << to_sq
-                moved = True
-            elif (bb[WQ] >> from_sq) & 1:
-                bb[WQ] &= ~(1 << from_sq)
-                bb[WQ] |= 1 << to_sq
-                moved = True
+            own = self.occ_black
+            diag = bb[WB] | bb[WQ]
+            ortho = bb[WR] | bb[WQ]
+        snipers = (diag & BISHOP_RAYS[king_sq]) | (ortho & ROOK_RAYS[king_sq])
+        if not snipers:
+            # No enemy slider on any line through the king (always true without sliders)
+            return 0
+        pinned = 0
+        occ = self.occ_all
+        between = BETWEEN[king_sq]
+        while snipers:
+            lsb = snipers & -snipers
+            blockers = between[lsb.bit_length() - 1] & occ
+            # Exactly one piece in between, and it is ours
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+            snipers ^= lsb
+        return pinned
+
+    def _en_passant_exposes_king(self, king_sq: int, from_sq: int, to_sq: int, white: bool) -> bool:
+        """Return True if `white`'s en passant `from_sq`->`to_sq` leaves its king attacked.
+
+        The capture empties two squares and fills one, so sliders are re-tested on the
+        resulting occupancy; a pawn or knight checker survives unless it is the captured pawn.
+        """
+        bb = self.bb
+        cap_bit = SQUARE_BIT[to_sq ^ 8]
+        occ = self.occ_all ^ SQUARE_BIT[from_sq] ^ cap_bit ^ SQUARE_BIT[to_sq]
+        if white:
+            leapers = (bb[BP] & BLACK_PAWN_ATTACKERS[king_sq]) | (bb[BN] & KNIGHT_ATTACKS[king_sq])
+            diag = bb[BB] | bb[BQ]
+            ortho = bb[BR] | bb[BQ]
         else:
-            if (bb[BP] >> from_sq) & 1:
-                bb[BP] &= ~(1 << from_sq)
-                if (
-                    self.ep_square is not None
-                    and to_sq == self.ep_square
-                    and (from_sq - to_sq) in (7, 9)
-                ):
-                    cap_sq = to_sq + 8
-                    bb[WP] &= ~(1 << cap_sq)
-                if move.promotion:
-                    promo_map = {"q": BQ, "r": BR, "b": BB, "n": BN}
-                    bb[promo_map[move.promotion]] |= 1 << to_sq
-                else:
-                    bb[BP] |= 1 << to_sq
-                moved = True
-            elif (bb[BN] >> from_sq) & 1:
-                bb[BN] &= ~(1 << from_sq)
-                bb[BN] |= 1 << to_sq
-                moved = True
-            elif (bb[BK] >> from_sq) & 1:
-                bb[BK] &= ~(1 << from_sq)
-                bb[BK] |= 1 << to_sq
-                if abs(to_sq - from_sq) == 2:
-                    if to_sq == 62:  # black kingside e8->g8, rook h8->f8
-                        bb[BR] &= ~(1 << 63)
-                        bb[BR] |= 1 << 61
-                    elif to_sq == 58:  # black queenside e8->c8, rook a8->d8
-                        bb[BR] &= ~(1 << 56)
-                        bb[BR] |= 1 << 59
-                moved = True
-            elif (bb[BB] >> from_sq) & 1:
-                bb[BB] &= ~(1 << from_sq)
-                bb[BB] |= 1 << to_sq
-                moved = True
-            elif (bb[BR] >> from_sq) & 1:
-                bb[BR] &= ~(1 << from_sq)
-                bb[BR] |= 1 << to_sq
-                moved = True
-            elif (bb[BQ] >> from_sq) & 1:
-                bb[BQ] &= ~(1 << from_sq)
-                bb[BQ] |= 1 << to_sq
-                moved = True
-
-        if not moved:
-            return None
-        return bb
+            leapers = (bb[WP] & WHITE_PAWN_ATTACKERS[king_sq]) | (bb[WN] & KNIGHT_ATTACKS[king_sq])
+            diag = bb[WB] | bb[WQ]
+            ortho = bb[WR] | bb[WQ]
+        if leapers & ~cap_bit:
+            return True
+        return bool(bishop_attacks(king_sq, occ) & diag or rook_attacks(king_sq, occ) & ortho)
+
+    def _attack_bitmap(self, by_white: bool, occ: Optional[int] = None) -> int:
+        """Return a bitboard of every square attacked by the given side.
+
+        One pass over the attacking pieces answers any number of square queries
+        (`attacked >> sq & 1`). Pass `occ` with the defending king removed to see
+        through it when testing the king's flight squares.
+        """
+        bb = self.bb
+        if occ is None:
+            occ = self.occ_all
+        if by_white:
+            pawns, knights, king = bb[WP], bb[WN], bb[WK]
+            diag, ortho = bb[WB] | bb[WQ], bb[WR] | bb[WQ]
+            attacks = ((pawns << 9) & NOT_FILE_A) | ((pawns << 7) & NOT_FILE_H)
+        else:
+            pawns, knights, king = bb[BP], bb[BN], bb[BK]
+            diag, ortho = bb[BB] | bb[BQ], bb[BR] | bb[BQ]
+            attacks = ((pawns >> 7) & NOT_FILE_A) | ((pawns >> 9) & NOT_FILE_H)
+
+        while knights:
+            lsb = knights & -knights
+            attacks |= KNIGHT_ATTACKS[lsb.bit_length() - 1]
+            knights ^= lsb
+        if king:
+            attacks |= KING_ATTACKS[king.bit_length() - 1]
+
+        while diag:
+            lsb = diag & -diag
+            attacks |= bishop_attacks(lsb.bit_length() - 1, occ)
+            diag ^= lsb
+        while ortho:
+            lsb = ortho & -ortho
+            attacks |= rook_attacks(lsb.bit_length() - 1, occ)
+            ortho ^= lsb
+        return attacks & BB_ALL
+
+    def _is_attacked(self, sq: int, *, by_white: bool) -> bool:
+        """Return True if square `sq` is attacked by the given side.
+
+        Covers: pawns, knights, king, and slider rays for bishops/rooks/queens. Tests
+        run cheapest first and return on the first attacker found.
+        """
+        bb = self.bb
+
+        # Select the attacking side's boards once; the loops below are colour-free
+        if by_white:
+            if bb[WP] & WHITE_PAWN_ATTACKERS[sq]:
+                return True
+            knights, king = bb[WN], bb[WK]
+            queens = bb[WQ]
+            diag = (bb[WB] | queens) & BISHOP_RAYS[sq]
+            ortho = (bb[WR] | queens) & ROOK_RAYS[sq]
+        else:
+            if bb[BP] & BLACK_PAWN_ATTACKERS[sq]:
+                return True
+            knights, king = bb[BN], bb[BK]
+            queens = bb[BQ]
+            diag = (bb[BB] | queens) & BISHOP_RAYS[sq]
+            ortho = (bb[BR] | queens) & ROOK_RAYS[sq]
+
+        # Leaper attacks are symmetric: a knight/king attacks `sq` iff it stands on a
+        # square that a knight/king on `sq` would attack
+        if knights & KNIGHT_ATTACKS[sq] or king & KING_ATTACKS[sq]:
+            return True
+
+        # Slider attacks (bishop/rook/queen). Only sliders standing on one of the
+        # empty-board rays through `sq` can attack it. Attacks are symmetric for sliders:
+        # look up the attack set from `sq` itself in the occupancy-indexed line tables
+        # and intersect it with the candidate sliders.
+        occ = self.occ_all
+        if diag and bishop_attacks(sq, occ) & diag:
+            return True
+        if ortho and rook_attacks(sq, occ) & ortho:
+            return True
+
+        return False
 
-    # --- Status helpers ---
     def in_check(self, side: Optional[str] = None) -> bool:
         """Return True if `side` (default: current side to move) is in check."""
         s = self.side_to_move if side is None else side
@@ -1174,15 +1467,33 @@ class Board:
             king_bb = self.bb[WK]
             if king_bb == 0:
                 return False
-            ksq = (king_bb & -king_bb).bit_length() - 1
+            ksq = king_bb.bit_length() - 1
             return self._is_attacked(ksq, by_white=False)
         else:
             king_bb = self.bb[BK]
             if king_bb == 0:
                 return False
-            ksq = (king_bb & -king_bb).bit_length() - 1
+            ksq = king_bb.bit_length() - 1
             return self._is_attacked(ksq, by_white=True)
 
     def has_legal_moves(self) -> bool:
-        """Return True if the side to move has at least one legal move."""
+        """Return True if the side to move has at least one legal move.
+
+        Answers from the move cache, or from a single safe king step, before falling back
+        to full generation; mate and stalemate tests rarely need the whole list.
+        """
+        cached = self._cached_moves
+        if (
+            cached is not None
+            and cached[0] == self.zobrist_hash
+            and cached[1] == (self.side_to_move, self.ep_square, self.castling_rights)
+        ):
+            return bool(cached[2])
+        is_white = self.side_to_move == "w"
+        king_bb = self.bb[WK] if is_white else self.bb[BK]
+        if king_bb:
+            own = self.occ_white if is_white else self.occ_black
+            attacked = self._attack_bitmap(by_white=not is_white, occ=self.occ_all ^ king_bb)
+            if KING_ATTACKS[king_bb.bit_length() - 1] & ~own & ~attacked:
+                return True
         return bool(self.generate_legal_moves())
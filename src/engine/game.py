@@ -39,29 +39,29 @@ class Game:
         return self.board.generate_legal_moves()
 
     def apply_move(self, move: Move) -> None:
+        board = self.board
         # Validate legality
-        legal = self.board.generate_legal_moves()
-        if not any(
-            (m.from_sq == move.from_sq and m.to_sq == move.to_sq and m.promotion == move.promotion)
-            for m in legal
-        ):
+        if not board.is_legal(move):
             raise ValueError("illegal move")
         # Make move in-place and record for undo
-        self.board.make_move(move)
+        board.make_move(move)
         self.move_stack.append(move)
-        # Update repetition with new hash
-        h = self.board.zobrist_hash
-        self.repetition[h] = self.repetition.get(h, 0) + 1
+        # Update repetition with the new hash (maintained incrementally by make_move)
+        h = board.zobrist_hash
+        repetition = self.repetition
+        repetition[h] = repetition.get(h, 0) + 1
 
     def undo_move(self) -> None:
         if not self.move_stack:
             raise ValueError("no moves to undo")
         # Decrement count for current position
         curr = self.board.zobrist_hash
-        if curr in self.repetition:
-            self.repetition[curr] -= 1
-            if self.repetition[curr] <= 0:
-                del self.repetition[curr]
+        repetition = self.repetition
+        count = repetition.get(curr, 0)
+        if count > 1:
+            repetition[curr] = count - 1
+        elif count:
+            del repetition[curr]
         last = self.move_stack.pop()
         self.board.unmake_move(last)
 
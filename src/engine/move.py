@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 
 PROMOTION_PIECES = {"q", "r", "b", "n"}
 
+# Algebraic names by square index (a1 = 0) and the reverse lookup
+SQUARE_NAMES: Tuple[str, ...] = tuple(f + r for r in "12345678" for f in "abcdefgh")
+SQUARE_INDEX: Dict[str, int] = {name: sq for sq, name in enumerate(SQUARE_NAMES)}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Move:
     """Engine-internal move type.
 
@@ -20,7 +24,29 @@ class Move:
     promotion: Optional[str] = None
 
     def to_uci(self) -> str:
-        return square_to_str(self.from_sq) + square_to_str(self.to_sq) + (self.promotion or "")
+        return SQUARE_NAMES[self.from_sq] + SQUARE_NAMES[self.to_sq] + (self.promotion or "")
+
+
+def _promotion_moves() -> Dict[int, Tuple[Move, ...]]:
+    table: Dict[int, Tuple[Move, ...]] = {}
+    for from_rank, to_rank in ((6, 7), (1, 0)):
+        for f in range(8):
+            for tf in (f - 1, f, f + 1):
+                if 0 <= tf < 8:
+                    from_sq = from_rank * 8 + f
+                    to_sq = to_rank * 8 + tf
+                    table[from_sq << 6 | to_sq] = tuple(Move(from_sq, to_sq, p) for p in "qrbn")
+    return table
+
+
+# Interned moves. Move is immutable, so move generation hands out these shared instances
+# instead of allocating: MOVES[from_sq][to_sq] is the non-promotion move, and
+# PROMOTION_MOVES[from_sq << 6 | to_sq] the q/r/b/n promotions of a pawn step or capture
+# onto the last rank.
+MOVES: Tuple[Tuple[Move, ...], ...] = tuple(
+    tuple(Move(from_sq, to_sq) for to_sq in range(64)) for from_sq in range(64)
+)
+PROMOTION_MOVES: Dict[int, Tuple[Move, ...]] = _promotion_moves()
 
 
 def parse_uci(uci: str) -> Move:
@@ -38,16 +64,13 @@ def parse_uci(uci: str) -> Move:
 
 
 def str_to_square(s: str) -> int:
-    if len(s) != 2 or s[0] < "a" or s[0] > "h" or s[1] < "1" or s[1] > "8":
-        raise ValueError(f"invalid square: {s!r}")
-    file = ord(s[0]) - ord("a")
-    rank = int(s[1]) - 1
-    return rank * 8 + file
+    try:
+        return SQUARE_INDEX[s]
+    except KeyError:
+        raise ValueError(f"invalid square: {s!r}") from None
 
 
 def square_to_str(idx: int) -> str:
     if idx < 0 or idx > 63:
         raise ValueError(f"invalid square index: {idx}")
-    file = idx % 8
-    rank = idx // 8
-    return chr(ord("a") + file) + str(rank + 1)
+    return SQUARE_NAMES[idx]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from typing import Dict, Tuple
+
 from .board import Board
-from .move import Move
+
+# Cap on transposition entries kept per perft call; once full, new subtrees are no longer
+# stored (existing entries still answer lookups)
+PERFT_TABLE_LIMIT = 1 << 18
 
 
 def perft(board: Board, depth: int) -> int:
@@ -11,23 +16,37 @@ def perft(board: Board, depth: int) -> int:
     - depth == 0 returns 1 (the current node).
     - depth > 0 returns the sum over all legal child positions' perft(depth-1).
 
-    Note: This scaffolding relies on `Board.generate_legal_moves()` which is
-    currently a stub; once legal move generation is implemented, results will
-    be meaningful. The make/unmake workflow will replace copy-apply if needed.
+    Uses in-place make/unmake, counts leaf moves in bulk at depth 1, and reuses subtree
+    counts for positions reached by transposition within the call.
     """
     if depth < 0:
         raise ValueError("depth must be >= 0")
     if depth == 0:
         return 1
 
+    return _perft(board, depth, {})
+
+
+def _perft(board: Board, depth: int, table: Dict[Tuple[int, int], int]) -> int:
+    # Moves are fully legal, so the last ply is counted without making them (bulk
+    # counting, by popcount with no move list); locals are bound once per node for the
+    # recursive inner loop.
+    if depth == 1:
+        return board.count_legal_moves()
+    # The Zobrist hash covers placement, side, castling rights and en passant, which is
+    # everything the subtree count depends on
+    key = (board.zobrist_hash, depth)
+    nodes = table.get(key)
+    if nodes is not None:
+        return nodes
+    moves = board.generate_legal_moves()
+    make = board.make_move
+    unmake = board.unmake_move
     nodes = 0
-    for m in board.generate_legal_moves():
-        board.make_move(m)
-        nodes += perft(board, depth - 1)
-        board.unmake_move(m)
+    for m in moves:
+        make(m)
+        nodes += _perft(board, depth - 1, table)
+        unmake(m)
+    if len(table) < PERFT_TABLE_LIMIT:
+        table[key] = nodes
     return nodes
-
-
-def _apply_pseudo_move(board: Board, move: Move) -> Board | None:  # pragma: no cover
-    # Deprecated helper retained temporarily; not used by perft.
-    return None
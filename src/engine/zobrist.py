@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, TYPE_CHECKING
+from typing import List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from .board import Board
@@ -10,6 +10,8 @@ MASK64 = 0xFFFFFFFFFFFFFFFF
 
 
 class _SplitMix64:
+    __slots__ = ("state",)
+
     def __init__(self, seed: int) -> None:
         self.state = seed & MASK64
 
@@ -30,12 +32,16 @@ class Zobrist:
     - piece_square[12][64]: indices follow Board piece order (WP..BK)
     - side_to_move: toggle for black side to move
     - castling[4]: K, Q, k, q
+    - castling_rights[16]: combined castling key per rights bitmask (K=1, Q=2, k=4, q=8)
     - ep_file[8]: files a..h
     """
 
+    __slots__ = ("castling", "castling_rights", "ep_file", "piece_square", "side_to_move")
+
     piece_square: List[List[int]]
     side_to_move: int
     castling: List[int]
+    castling_rights: List[int]
     ep_file: List[int]
 
     def __init__(self, seed: int = 0xC0FFEE_F00D_DEAD) -> None:
@@ -47,11 +53,25 @@ class Zobrist:
         self.side_to_move = prng.next()
         self.castling = [prng.next() for _ in range(4)]  # K, Q, k, q
         self.ep_file = [prng.next() for _ in range(8)]  # a..h
+        # XOR of the individual keys for every rights mask; since XOR is linear,
+        # castling_rights[a ^ b] toggles from rights `a` to rights `b` in one step.
+        self.castling_rights = [0] * 16
+        for mask in range(16):
+            for i in range(4):
+                if mask & (1 << i):
+                    self.castling_rights[mask] ^= self.castling[i]
 
 
 # Global deterministic table
 ZOBRIST = Zobrist()
 
+# Immutable flat views of the table for hot paths: plain tuple indexing, no attribute lookups
+ZOBRIST_PIECE: Tuple[Tuple[int, ...], ...] = tuple(tuple(row) for row in ZOBRIST.piece_square)
+ZOBRIST_CASTLING: Tuple[int, ...] = tuple(ZOBRIST.castling_rights)  # indexed by rights mask
+# En passant key per target square (its file's key), so callers skip the file split
+ZOBRIST_EP_SQ: Tuple[int, ...] = tuple(ZOBRIST.ep_file[sq & 7] for sq in range(64))
+ZOBRIST_STM: int = ZOBRIST.side_to_move
+
 
 def compute_hash_from_scratch(board: "Board") -> int:
     """Compute 64-bit Zobrist hash from a Board.
@@ -61,25 +81,20 @@ def compute_hash_from_scratch(board: "Board") -> int:
     h = 0
     # Pieces
     for p in range(12):
+        keys = ZOBRIST_PIECE[p]
         bb = board.bb[p]
         while bb:
             lsb = bb & -bb
-            sq = lsb.bit_length() - 1
-            h ^= ZOBRIST.piece_square[p][sq]
+            h ^= keys[lsb.bit_length() - 1]
             bb ^= lsb
     # Side to move
     if board.side_to_move == "b":
-        h ^= ZOBRIST.side_to_move
-    # Castling rights in fixed order KQkq
-    if board.castling:
-        order = "KQkq"
-        for i, ch in enumerate(order):
-            if ch in board.castling:
-                h ^= ZOBRIST.castling[i]
+        h ^= ZOBRIST_STM
+    # Castling rights (KQkq bitmask)
+    h ^= ZOBRIST_CASTLING[board.castling_rights]
     # En passant file (if any)
     if board.ep_square is not None:
-        file_idx = board.ep_square % 8
-        h ^= ZOBRIST.ep_file[file_idx]
+        h ^= ZOBRIST_EP_SQ[board.ep_square]
     return h & MASK64
 
 
@@ -94,30 +109,24 @@ def incremental_hash_update(current_hash: int, board_before: "Board", board_afte
 
     # Piece-square toggles for any differences across all 12 piece bitboards
     for p in range(12):
+        keys = ZOBRIST_PIECE[p]
         diff = (board_before.bb[p] ^ board_after.bb[p]) & MASK64
         while diff:
             lsb = diff & -diff
-            sq = lsb.bit_length() - 1
-            h ^= ZOBRIST.piece_square[p][sq]
+            h ^= keys[lsb.bit_length() - 1]
             diff ^= lsb
 
     # Side to move toggle
     if board_before.side_to_move != board_after.side_to_move:
-        h ^= ZOBRIST.side_to_move
+        h ^= ZOBRIST_STM
 
-    # Castling rights: toggle rights present in before, then those present in after
-    order = "KQkq"
-    for i, ch in enumerate(order):
-        if ch in board_before.castling:
-            h ^= ZOBRIST.castling[i]
-    for i, ch in enumerate(order):
-        if ch in board_after.castling:
-            h ^= ZOBRIST.castling[i]
+    # Castling rights: one key for the rights that changed
+    h ^= ZOBRIST_CASTLING[board_before.castling_rights ^ board_after.castling_rights]
 
     # En passant file: toggle previous (if any) then new (if any)
     if board_before.ep_square is not None:
-        h ^= ZOBRIST.ep_file[board_before.ep_square % 8]
+        h ^= ZOBRIST_EP_SQ[board_before.ep_square]
     if board_after.ep_square is not None:
-        h ^= ZOBRIST.ep_file[board_after.ep_square % 8]
+        h ^= ZOBRIST_EP_SQ[board_after.ep_square]
 
     return h & MASK64
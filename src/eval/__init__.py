@@ -21,6 +21,12 @@ from src.engine.board import (
     BR,
     BQ,
     BK,
+    BB_ALL,
+    KNIGHT_ATTACKS,
+    NOT_FILE_A,
+    NOT_FILE_H,
+    bishop_attacks,
+    rook_attacks,
 )
 
 
@@ -53,10 +59,6 @@ PASSED_PAWN_MG: Final = [0, 5, 10, 20, 35, 60, 90, 0]
 PASSED_PAWN_EG: Final = [0, 10, 20, 35, 60, 90, 140, 0]
 
 
-def _popcount(x: int) -> int:
-    return x.bit_count()
-
-
 def _iter_bits(bb: int) -> Iterable[int]:
     while bb:
         lsb = bb & -bb
@@ -65,13 +67,6 @@ def _iter_bits(bb: int) -> Iterable[int]:
         bb ^= lsb
 
 
-def _mirror_sq(sq: int) -> int:
-    # Flip vertically (rank mirror)
-    f = sq % 8
-    r = sq // 8
-    return (7 - r) * 8 + f
-
-
 def _file_mask(file_idx: int) -> int:
     mask = 0
     for r in range(8):
@@ -80,53 +75,35 @@ def _file_mask(file_idx: int) -> int:
 
 
 FILE_MASKS: Final = tuple(_file_mask(f) for f in range(8))
+# Vertical flip (rank mirror) per square: Black reads White's tables through it
+MIRROR_SQ: Final = tuple(sq ^ 56 for sq in range(64))
+# Ranks 4-6 for white knights, 3-5 for black: outpost squares in the opponent's half
+WHITE_OUTPOST_RANKS: Final = 0x0000FFFFFF000000
+BLACK_OUTPOST_RANKS: Final = 0x000000FFFFFF0000
 
 
 def _count_knight_moves(sq: int, own_occ: int) -> int:
-    f = sq % 8
-    r = sq // 8
-    cnt = 0
-    for df, dr in ((-1, 2), (1, 2), (-2, 1), (2, 1), (-2, -1), (2, -1), (-1, -2), (1, -2)):
-        tf, tr = f + df, r + dr
-        if 0 <= tf < 8 and 0 <= tr < 8:
-            to = tr * 8 + tf
-            if ((own_occ >> to) & 1) == 0:
-                cnt += 1
-    return cnt
-
-
-def _count_slider_moves(
-    sq: int, own_occ: int, occ_all: int, dirs: Iterable[tuple[int, int]]
-) -> int:
-    f = sq % 8
-    r = sq // 8
-    cnt = 0
-    for df, dr in dirs:
-        tf, tr = f, r
-        while True:
-            tf += df
-            tr += dr
-            if not (0 <= tf < 8 and 0 <= tr < 8):
-                break
-            to = tr * 8 + tf
-            if ((own_occ >> to) & 1) != 0:
-                break
-            cnt += 1
-            if ((occ_all >> to) & 1) != 0:
-                break
-    return cnt
+    return (KNIGHT_ATTACKS[sq] & ~own_occ).bit_count()
 
 
-def _king_shield_pawns(board: Board, white: bool) -> int:
-    # Count friendly pawns in two-rank ring in front of king on files f-1..f+1
-    king_bb = board.bb[WK] if white else board.bb[BK]
-    if king_bb == 0:
-        return 0
-    ksq = (king_bb & -king_bb).bit_length() - 1
-    kf = ksq % 8
-    kr = ksq // 8
-    pawns = board.bb[WP] if white else board.bb[BP]
-    total = 0
+def _count_bishop_moves(sq: int, own_occ: int, occ_all: int) -> int:
+    # Attack set already stops at the first blocker on each ray; drop own-piece squares
+    return (bishop_attacks(sq, occ_all) & ~own_occ).bit_count()
+
+
+def _count_rook_moves(sq: int, own_occ: int, occ_all: int) -> int:
+    return (rook_attacks(sq, occ_all) & ~own_occ).bit_count()
+
+
+def _count_queen_moves(sq: int, own_occ: int, occ_all: int) -> int:
+    return ((bishop_attacks(sq, occ_all) | rook_attacks(sq, occ_all)) & ~own_occ).bit_count()
+
+
+def _king_shield_mask(ksq: int, white: bool) -> int:
+    # Two-rank ring in front of the king on files f-1..f+1
+    kf = ksq & 7
+    kr = ksq >> 3
+    mask = 0
     for df in (-1, 0, 1):
         ff = kf + df
         if not (0 <= ff < 8):
@@ -134,86 +111,50 @@ def _king_shield_pawns(board: Board, white: bool) -> int:
         for dr in (1, 2):
             rr = kr + (dr if white else -dr)
             if 0 <= rr < 8:
-                sq = rr * 8 + ff
-                if ((pawns >> sq) & 1) != 0:
-                    total += 1
-    return total
-
-
-def _pawn_attacks_square(board: Board, sq: int, by_white: bool) -> bool:
-    f = sq % 8
-    if by_white:
-        # White pawns attack from behind (downwards relative to sq): sq-7 and sq-9
-        if f > 0:
-            o = sq - 9
-            if o >= 0 and ((board.bb[WP] >> o) & 1):
-                return True
-        if f < 7:
-            o = sq - 7
-            if o >= 0 and ((board.bb[WP] >> o) & 1):
-                return True
-    else:
-        # Black pawns attack from ahead (upwards relative to sq): sq+7 and sq+9
-        if f < 7:
-            o = sq + 9
-            if o <= 63 and ((board.bb[BP] >> o) & 1):
-                return True
-        if f > 0:
-            o = sq + 7
-            if o <= 63 and ((board.bb[BP] >> o) & 1):
-                return True
-    return False
-
-
-def _pawn_supports_square(board: Board, sq: int, white: bool) -> bool:
-    f = sq % 8
+                mask |= 1 << (rr * 8 + ff)
+    return mask
+
+
+KING_SHIELD_MASKS: Final = (
+    tuple(_king_shield_mask(sq, False) for sq in range(64)),
+    tuple(_king_shield_mask(sq, True) for sq in range(64)),
+)
+
+
+def _king_shield_pawns(board: Board, white: bool) -> int:
+    # Count friendly pawns in two-rank ring in front of king on files f-1..f+1
+    king_bb = board.bb[WK] if white else board.bb[BK]
+    if king_bb == 0:
+        return 0
+    pawns = board.bb[WP] if white else board.bb[BP]
+    return (pawns & KING_SHIELD_MASKS[white][king_bb.bit_length() - 1]).bit_count()
+
+
+def _pawn_attacks(pawns: int, white: bool) -> int:
+    # Squares attacked by any of `pawns`, shifted set-wise; the file masks drop captures
+    # that would wrap from the a-file to the h-file or back
     if white:
-        if f > 0:
-            o = sq - 9
-            if o >= 0 and ((board.bb[WP] >> o) & 1):
-                return True
-        if f < 7:
-            o = sq - 7
-            if o >= 0 and ((board.bb[WP] >> o) & 1):
-                return True
-    else:
-        if f < 7:
-            o = sq + 9
-            if o <= 63 and ((board.bb[BP] >> o) & 1):
-                return True
-        if f > 0:
-            o = sq + 7
-            if o <= 63 and ((board.bb[BP] >> o) & 1):
-                return True
-    return False
-
-
-def _is_passed_pawn(board: Board, sq: int, white: bool) -> bool:
-    # A pawn is passed if there is no opposing pawn on the same or adjacent files
-    # on any square ahead of it (toward promotion).
-    f = sq % 8
-    r = sq // 8
-    opp_pawns = board.bb[BP] if white else board.bb[WP]
-
-    files = []
-    if f > 0:
-        files.append(FILE_MASKS[f - 1])
-    files.append(FILE_MASKS[f])
-    if f < 7:
-        files.append(FILE_MASKS[f + 1])
+        return (((pawns & NOT_FILE_A) << 7) | ((pawns & NOT_FILE_H) << 9)) & BB_ALL
+    return ((pawns & NOT_FILE_A) >> 9) | ((pawns & NOT_FILE_H) >> 7)
 
-    mask = 0
-    for fm in files:
-        if white:
-            # squares with index > r*8+7 -> ranks r+1..7
-            cutoff = (r + 1) * 8
-            mask |= fm & (~((1 << cutoff) - 1))
-        else:
-            # squares with index < r*8 -> ranks 0..r-1
-            cutoff = r * 8
-            mask |= fm & ((1 << cutoff) - 1)
 
-    return (opp_pawns & mask) == 0
+def _passed_pawns(own_pawns: int, opp_pawns: int, white: bool) -> int:
+    # A pawn is passed if there is no opposing pawn on the same or adjacent files
+    # on any square ahead of it (toward promotion). Computed for all pawns at once:
+    # fill each opposing pawn's span behind it (from its side's view, i.e. towards
+    # our pawns), widen to the adjacent files, and keep own pawns outside that region.
+    if white:
+        span = opp_pawns >> 8
+        span |= span >> 8
+        span |= span >> 16
+        span |= span >> 32
+    else:
+        span = (opp_pawns << 8) & BB_ALL
+        span |= (span << 8) & BB_ALL
+        span |= (span << 16) & BB_ALL
+        span |= (span << 32) & BB_ALL
+    blocked = span | ((span << 1) & NOT_FILE_A) | ((span >> 1) & NOT_FILE_H)
+    return own_pawns & ~blocked
 
 
 # Simple piece-square tables (white perspective), centipawns
@@ -688,51 +629,39 @@ PSQT_K_EG: Final = [
 ]
 
 
+# Material plus piece-square value per (piece, square), signed from White's view and
+# pre-mirrored for Black, so one pass over each piece's bits scores both terms. Kings
+# are blended by game phase in `evaluate`; their all-zero rows keep rows indexed by piece.
+PIECE_SQUARE_VALUES: Final = tuple(
+    tuple((value + table[sq]) if white else -(value + table[MIRROR_SQ[sq]]) for sq in range(64))
+    for white in (True, False)
+    for value, table in (
+        (P_VAL, PSQT_P),
+        (N_VAL, PSQT_N),
+        (B_VAL, PSQT_B),
+        (R_VAL, PSQT_R),
+        (Q_VAL, PSQT_Q),
+        (0, [0] * 64),
+    )
+)
+
+
 def evaluate(board: Board) -> int:
     """Return a material + PSQT evaluation in centipawns.
 
     Positive means advantage for White. Side-to-move adjustment is done by
     the search (negamax) so this function is side-agnostic.
     """
-    # Material
-    wp = _popcount(board.bb[WP]) * P_VAL
-    wn = _popcount(board.bb[WN]) * N_VAL
-    wb = _popcount(board.bb[WB]) * B_VAL
-    wr = _popcount(board.bb[WR]) * R_VAL
-    wq = _popcount(board.bb[WQ]) * Q_VAL
-
-    bp = _popcount(board.bb[BP]) * P_VAL
-    bn = _popcount(board.bb[BN]) * N_VAL
-    bb_ = _popcount(board.bb[BB]) * B_VAL
-    br = _popcount(board.bb[BR]) * R_VAL
-    bq = _popcount(board.bb[BQ]) * Q_VAL
-
-    material_white = wp + wn + wb + wr + wq
-    material_black = bp + bn + bb_ + br + bq
-
-    score = material_white - material_black
-
-    # Piece-square terms
-    for sq in _iter_bits(board.bb[WP]):
-        score += PSQT_P[sq]
-    for sq in _iter_bits(board.bb[WN]):
-        score += PSQT_N[sq]
-    for sq in _iter_bits(board.bb[WB]):
-        score += PSQT_B[sq]
-    for sq in _iter_bits(board.bb[WR]):
-        score += PSQT_R[sq]
-    for sq in _iter_bits(board.bb[WQ]):
-        score += PSQT_Q[sq]
-    for sq in _iter_bits(board.bb[BP]):
-        score -= PSQT_P[_mirror_sq(sq)]
-    for sq in _iter_bits(board.bb[BN]):
-        score -= PSQT_N[_mirror_sq(sq)]
-    for sq in _iter_bits(board.bb[BB]):
-        score -= PSQT_B[_mirror_sq(sq)]
-    for sq in _iter_bits(board.bb[BR]):
-        score -= PSQT_R[_mirror_sq(sq)]
-    for sq in _iter_bits(board.bb[BQ]):
-        score -= PSQT_Q[_mirror_sq(sq)]
+    # Material and piece-square terms, fused into one table lookup per piece
+    score = 0
+    bbs = board.bb
+    for piece in (WP, WN, WB, WR, WQ, BP, BN, BB, BR, BQ):
+        values = PIECE_SQUARE_VALUES[piece]
+        pieces = bbs[piece]
+        while pieces:
+            lsb = pieces & -pieces
+            score += values[lsb.bit_length() - 1]
+            pieces ^= lsb
 
     # Game phase blending (0..128 scale)
     knights = (board.bb[WN] | board.bb[BN]).bit_count()
@@ -748,15 +677,13 @@ def evaluate(board: Board) -> int:
     for sq in _iter_bits(board.bb[WK]):
         score += (mg_scaled * PSQT_K[sq] + eg_scaled * PSQT_K_EG[sq]) // 128
     for sq in _iter_bits(board.bb[BK]):
-        idx = _mirror_sq(sq)
+        idx = MIRROR_SQ[sq]
         score -= (mg_scaled * PSQT_K[idx] + eg_scaled * PSQT_K_EG[idx]) // 128
 
     # Mobility (simple pseudo-legal without self-occupancy)
-    occ_all = 0
-    for bb in board.bb:
-        occ_all |= bb
-    occ_w = board.bb[WP] | board.bb[WN] | board.bb[WB] | board.bb[WR] | board.bb[WQ] | board.bb[WK]
-    occ_b = board.bb[BP] | board.bb[BN] | board.bb[BB] | board.bb[BR] | board.bb[BQ] | board.bb[BK]
+    occ_all = board.occ_all
+    occ_w = board.occ_white
+    occ_b = board.occ_black
 
     # Knights
     w_mob = 0
@@ -769,35 +696,32 @@ def evaluate(board: Board) -> int:
     score += (w_mob - b_mob) * mob_n
 
     # Bishops
-    dirs_b = ((-1, -1), (1, -1), (-1, 1), (1, 1))
     w_mob = 0
     b_mob = 0
     for sq in _iter_bits(board.bb[WB]):
-        w_mob += _count_slider_moves(sq, occ_w, occ_all, dirs_b)
+        w_mob += _count_bishop_moves(sq, occ_w, occ_all)
     for sq in _iter_bits(board.bb[BB]):
-        b_mob += _count_slider_moves(sq, occ_b, occ_all, dirs_b)
+        b_mob += _count_bishop_moves(sq, occ_b, occ_all)
     mob_b = (mg_scaled * MOB_B_MG + eg_scaled * MOB_B_EG) // 128
     score += (w_mob - b_mob) * mob_b
 
     # Rooks
-    dirs_r = ((-1, 0), (1, 0), (0, -1), (0, 1))
     w_mob = 0
     b_mob = 0
     for sq in _iter_bits(board.bb[WR]):
-        w_mob += _count_slider_moves(sq, occ_w, occ_all, dirs_r)
+        w_mob += _count_rook_moves(sq, occ_w, occ_all)
     for sq in _iter_bits(board.bb[BR]):
-        b_mob += _count_slider_moves(sq, occ_b, occ_all, dirs_r)
+        b_mob += _count_rook_moves(sq, occ_b, occ_all)
     mob_r = (mg_scaled * MOB_R_MG + eg_scaled * MOB_R_EG) // 128
     score += (w_mob - b_mob) * mob_r
 
     # Queens
-    dirs_q = dirs_b + dirs_r
     w_mob = 0
     b_mob = 0
     for sq in _iter_bits(board.bb[WQ]):
-        w_mob += _count_slider_moves(sq, occ_w, occ_all, dirs_q)
+        w_mob += _count_queen_moves(sq, occ_w, occ_all)
     for sq in _iter_bits(board.bb[BQ]):
-        b_mob += _count_slider_moves(sq, occ_b, occ_all, dirs_q)
+        b_mob += _count_queen_moves(sq, occ_b, occ_all)
     mob_q = (mg_scaled * MOB_Q_MG + eg_scaled * MOB_Q_EG) // 128
     score += (w_mob - b_mob) * mob_q
 
@@ -812,7 +736,7 @@ def evaluate(board: Board) -> int:
     wpawns = board.bb[WP]
     bpawns = board.bb[BP]
     for sq in _iter_bits(board.bb[WR]):
-        f = sq % 8
+        f = sq & 7
         file_mask = FILE_MASKS[f]
         own_pawn = (wpawns & file_mask) != 0
         opp_pawn = (bpawns & file_mask) != 0
@@ -821,7 +745,7 @@ def evaluate(board: Board) -> int:
         elif not own_pawn and opp_pawn:
             score += ROOK_SEMIOPEN_BONUS
     for sq in _iter_bits(board.bb[BR]):
-        f = sq % 8
+        f = sq & 7
         file_mask = FILE_MASKS[f]
         own_pawn = (bpawns & file_mask) != 0
         opp_pawn = (wpawns & file_mask) != 0
@@ -832,27 +756,18 @@ def evaluate(board: Board) -> int:
 
     # Rooks on seventh rank (from own perspective): white on rank 7 (index 6), black on rank 2 (index 1)
     for sq in _iter_bits(board.bb[WR]):
-        if (sq // 8) == 6:
+        if (sq >> 3) == 6:
             score += ROOK_SEVENTH_BONUS
     for sq in _iter_bits(board.bb[BR]):
-        if (sq // 8) == 1:
+        if (sq >> 3) == 1:
             score -= ROOK_SEVENTH_BONUS
 
     # Knight outposts: in opponent half, supported by own pawn, not attackable by enemy pawns
-    for sq in _iter_bits(board.bb[WN]):
-        r = sq // 8
-        if 3 <= r <= 5:
-            if _pawn_supports_square(board, sq, True) and not _pawn_attacks_square(
-                board, sq, by_white=False
-            ):
-                score += OUTPOST_N_BONUS
-    for sq in _iter_bits(board.bb[BN]):
-        r = sq // 8
-        if 2 <= r <= 4:
-            if _pawn_supports_square(board, sq, False) and not _pawn_attacks_square(
-                board, sq, by_white=True
-            ):
-                score -= OUTPOST_N_BONUS
+    white_pawn_attacks = _pawn_attacks(board.bb[WP], True)
+    black_pawn_attacks = _pawn_attacks(board.bb[BP], False)
+    white_outposts = board.bb[WN] & WHITE_OUTPOST_RANKS & white_pawn_attacks & ~black_pawn_attacks
+    black_outposts = board.bb[BN] & BLACK_OUTPOST_RANKS & black_pawn_attacks & ~white_pawn_attacks
+    score += (white_outposts.bit_count() - black_outposts.bit_count()) * OUTPOST_N_BONUS
 
     # King safety: pawn shield in front of the king
     score += _king_shield_pawns(board, True) * KING_SHIELD_BONUS
@@ -862,13 +777,9 @@ def evaluate(board: Board) -> int:
     pp_scale = [
         (mg_scaled * mg + eg_scaled * eg) // 128 for mg, eg in zip(PASSED_PAWN_MG, PASSED_PAWN_EG)
     ]
-    for sq in _iter_bits(board.bb[WP]):
-        if _is_passed_pawn(board, sq, True):
-            r = sq // 8
-            score += pp_scale[r]
-    for sq in _iter_bits(board.bb[BP]):
-        if _is_passed_pawn(board, sq, False):
-            r = sq // 8
-            score -= pp_scale[7 - r]
+    for sq in _iter_bits(_passed_pawns(board.bb[WP], board.bb[BP], True)):
+        score += pp_scale[sq >> 3]
+    for sq in _iter_bits(_passed_pawns(board.bb[BP], board.bb[WP], False)):
+        score -= pp_scale[7 - (sq >> 3)]
 
     return score
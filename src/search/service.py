@@ -7,8 +7,28 @@ import time
 from src.engine.game import Game
 from src.engine.move import Move
 from src.eval import evaluate
-from src.engine.board import WP, WN, WB, WR, WQ, WK, BP, BN, BB, BR, BQ, BK
-from src.engine.zobrist import compute_hash_from_scratch
+from src.engine.board import (
+    WP,
+    WN,
+    WB,
+    WR,
+    WQ,
+    WK,
+    BP,
+    BN,
+    BB,
+    BR,
+    BQ,
+    BK,
+    BETWEEN,
+    BISHOP_RAYS,
+    BLACK_PAWN_ATTACKERS,
+    KING_ATTACKS,
+    KNIGHT_ATTACKS,
+    ROOK_RAYS,
+    SQUARE_BIT,
+    WHITE_PAWN_ATTACKERS,
+)
 
 
 @dataclass
@@ -83,28 +103,52 @@ class SearchService:
         INF = 10_000_000
         MATE_SCORE = 1_000_000  # mate scores are within +/- MATE_SCORE window
 
-        def probe(alpha: int, beta: int, d: int) -> Optional[Tuple[int, Optional[Move]]]:
+        MATE_BOUND = MATE_SCORE - 512  # scores beyond this are distance-to-mate
+
+        # Mate scores count plies from the root, so the TT keeps them relative to the node
+        # instead: a mate found at one ply must not be reused as-is at another.
+        def score_to_tt(score: int, ply: int) -> int:
+            if score >= MATE_BOUND:
+                return score + ply
+            if score <= -MATE_BOUND:
+                return score - ply
+            return score
+
+        def score_from_tt(score: int, ply: int) -> int:
+            if score >= MATE_BOUND:
+                return score - ply
+            if score <= -MATE_BOUND:
+                return score + ply
+            return score
+
+        def probe(alpha: int, beta: int, d: int, ply: int) -> Optional[Tuple[int, Optional[Move]]]:
             nonlocal tt_probes, tt_hits, tt_exact_hits, tt_lower_hits, tt_upper_hits
             tt_probes += 1
             e = tt.get(board.zobrist_hash)
             if e is None or e.depth < d:
                 return None
+            score = score_from_tt(e.score, ply)
             if e.flag == "EXACT":
                 tt_hits += 1
                 tt_exact_hits += 1
-                return e.score, e.best
-            if e.flag == "LOWER" and e.score >= beta:
+                return score, e.best
+            if e.flag == "LOWER" and score >= beta:
                 tt_hits += 1
                 tt_lower_hits += 1
-                return e.score, e.best
-            if e.flag == "UPPER" and e.score <= alpha:
+                return score, e.best
+            if e.flag == "UPPER" and score <= alpha:
                 tt_hits += 1
                 tt_upper_hits += 1
-                return e.score, e.best
+                return score, e.best
             return None
 
         def store(
-            depth_left: int, score: int, alpha_orig: int, beta: int, best: Optional[Move]
+            depth_left: int,
+            score: int,
+            alpha_orig: int,
+            beta: int,
+            best: Optional[Move],
+            ply: int,
         ) -> None:
             # Avoid polluting TT if we are out of time
             if movetime_ms is not None and time_up:
@@ -118,7 +162,7 @@ class SearchService:
                 flag = "EXACT"
             nonlocal tt_stores, tt_replacements
             key = board.zobrist_hash
-            new_entry = TTEntry(key, depth_left, flag, score, best, generation)
+            new_entry = TTEntry(key, depth_left, flag, score_to_tt(score, ply), best, generation)
             existing = tt.get(key)
             if existing is None:
                 tt[key] = new_entry
@@ -173,109 +217,40 @@ class SearchService:
 
         # --- SEE helpers ---
         def piece_on_square(sq: int) -> Optional[int]:
-            for p in range(12):
-                if (board.bb[p] >> sq) & 1:
-                    return p
-            return None
+            p = board.mailbox[sq]
+            return p if p >= 0 else None
 
         def attackers_to_square(sq: int, occ: int, by_white: bool, removed_mask: int) -> int:
-            attackers = 0
-            f = sq % 8
-            r = sq // 8
-            # Pawns
+            # Pawns, knights and king via the per-square attack tables
+            bb = board.bb
             if by_white:
-                if f > 0:
-                    o = sq - 9
-                    if o >= 0 and ((board.bb[WP] >> o) & 1) and not ((removed_mask >> o) & 1):
-                        attackers |= 1 << o
-                if f < 7:
-                    o = sq - 7
-                    if o >= 0 and ((board.bb[WP] >> o) & 1) and not ((removed_mask >> o) & 1):
-                        attackers |= 1 << o
+                attackers = (
+                    (bb[WP] & WHITE_PAWN_ATTACKERS[sq])
+                    | (bb[WN] & KNIGHT_ATTACKS[sq])
+                    | (bb[WK] & KING_ATTACKS[sq])
+                )
             else:
-                if f < 7:
-                    o = sq + 9
-                    if o <= 63 and ((board.bb[BP] >> o) & 1) and not ((removed_mask >> o) & 1):
-                        attackers |= 1 << o
-                if f > 0:
-                    o = sq + 7
-                    if o <= 63 and ((board.bb[BP] >> o) & 1) and not ((removed_mask >> o) & 1):
-                        attackers |= 1 << o
-            # Knights
-            for df, dr in ((-1, 2), (1, 2), (-2, 1), (2, 1), (-2, -1), (2, -1), (-1, -2), (1, -2)):
-                tf = f + df
-                tr = r + dr
-                if 0 <= tf < 8 and 0 <= tr < 8:
-                    o = tr * 8 + tf
-                    if by_white:
-                        if ((board.bb[WN] >> o) & 1) and not ((removed_mask >> o) & 1):
-                            attackers |= 1 << o
-                    else:
-                        if ((board.bb[BN] >> o) & 1) and not ((removed_mask >> o) & 1):
-                            attackers |= 1 << o
-            # King
-            for df, dr in ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
-                tf = f + df
-                tr = r + dr
-                if 0 <= tf < 8 and 0 <= tr < 8:
-                    o = tr * 8 + tf
-                    if by_white:
-                        if ((board.bb[WK] >> o) & 1) and not ((removed_mask >> o) & 1):
-                            attackers |= 1 << o
-                    else:
-                        if ((board.bb[BK] >> o) & 1) and not ((removed_mask >> o) & 1):
-                            attackers |= 1 << o
-
-            # Sliders (bishops/rooks/queens)
-            def ray_dirs(diagonals: bool) -> List[Tuple[int, int]]:
-                return (
-                    [(-1, -1), (1, -1), (-1, 1), (1, 1)]
-                    if diagonals
-                    else [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                attackers = (
+                    (bb[BP] & BLACK_PAWN_ATTACKERS[sq])
+                    | (bb[BN] & KNIGHT_ATTACKS[sq])
+                    | (bb[BK] & KING_ATTACKS[sq])
                 )
-
-            # Bishop-like
-            for df, dr in ray_dirs(True):
-                tf, tr = f, r
-                while True:
-                    tf += df
-                    tr += dr
-                    if not (0 <= tf < 8 and 0 <= tr < 8):
-                        break
-                    o = tr * 8 + tf
-                    if (occ >> o) & 1:
-                        if by_white:
-                            if ((board.bb[WB] >> o) & 1 or (board.bb[WQ] >> o) & 1) and not (
-                                (removed_mask >> o) & 1
-                            ):
-                                attackers |= 1 << o
-                        else:
-                            if ((board.bb[BB] >> o) & 1 or (board.bb[BQ] >> o) & 1) and not (
-                                (removed_mask >> o) & 1
-                            ):
-                                attackers |= 1 << o
-                        break
-            # Rook-like
-            for df, dr in ray_dirs(False):
-                tf, tr = f, r
-                while True:
-                    tf += df
-                    tr += dr
-                    if not (0 <= tf < 8 and 0 <= tr < 8):
-                        break
-                    o = tr * 8 + tf
-                    if (occ >> o) & 1:
-                        if by_white:
-                            if ((board.bb[WR] >> o) & 1 or (board.bb[WQ] >> o) & 1) and not (
-                                (removed_mask >> o) & 1
-                            ):
-                                attackers |= 1 << o
-                        else:
-                            if ((board.bb[BR] >> o) & 1 or (board.bb[BQ] >> o) & 1) and not (
-                                (removed_mask >> o) & 1
-                            ):
-                                attackers |= 1 << o
-                        break
+            attackers &= ~removed_mask
+            # Sliders (bishops/rooks/queens): a slider on a shared line attacks `sq` iff
+            # nothing in `occ` lies strictly between them
+            if by_white:
+                diag = bb[WB] | bb[WQ]
+                ortho = bb[WR] | bb[WQ]
+            else:
+                diag = bb[BB] | bb[BQ]
+                ortho = bb[BR] | bb[BQ]
+            sliders = ((diag & BISHOP_RAYS[sq]) | (ortho & ROOK_RAYS[sq])) & ~removed_mask
+            between = BETWEEN[sq]
+            while sliders:
+                lsb = sliders & -sliders
+                if not between[lsb.bit_length() - 1] & occ:
+                    attackers |= lsb
+                sliders ^= lsb
             return attackers
 
         def see(move: Move) -> int:
@@ -283,10 +258,7 @@ class SearchService:
             to_sq = move.to_sq
             from_sq = move.from_sq
             side_white = board.side_to_move == "w"
-            # Occupancy
-            occ = 0
-            for b in board.bb:
-                occ |= b
+            occ = board.occ_all
             # Identify victim
             if board.ep_square is not None and move.to_sq == board.ep_square:
                 victim_sq = to_sq - 8 if side_white else to_sq + 8
@@ -309,12 +281,12 @@ class SearchService:
             gain: List[int] = [victim_value]
             removed_mask = 0
             # Remove victim
-            occ &= ~(1 << victim_sq)
-            removed_mask |= 1 << victim_sq
+            occ &= ~SQUARE_BIT[victim_sq]
+            removed_mask |= SQUARE_BIT[victim_sq]
             # Remove attacker from origin; occupy target
-            occ &= ~(1 << from_sq)
-            removed_mask |= 1 << from_sq
-            occ |= 1 << to_sq
+            occ &= ~SQUARE_BIT[from_sq]
+            removed_mask |= SQUARE_BIT[from_sq]
+            occ |= SQUARE_BIT[to_sq]
 
             curr_occ_val = piece_vals[attacker_piece]
             color_white = not side_white
@@ -342,8 +314,8 @@ class SearchService:
                     break
                 gain.append(curr_occ_val - gain[-1])
                 # Remove attacker from its square
-                occ &= ~(1 << best_sq)
-                removed_mask |= 1 << best_sq
+                occ &= ~SQUARE_BIT[best_sq]
+                removed_mask |= SQUARE_BIT[best_sq]
                 # New occupant is this capturing piece
                 curr_occ_val = piece_vals[best_piece]
                 color_white = not color_white
@@ -390,7 +362,7 @@ class SearchService:
                 return qsearch(alpha, beta, ply)
 
             # TT probe
-            hit = probe(alpha, beta, d)
+            hit = probe(alpha, beta, d, ply)
             tt_move: Optional[Move] = None
             if hit is not None:
                 score, m = hit
@@ -414,22 +386,15 @@ class SearchService:
                 else:
                     non_pawn = board.bb[BN] | board.bb[BB] | board.bb[BR] | board.bb[BQ]
                 if non_pawn != 0:
-                    prev_stm = board.side_to_move
-                    prev_ep = board.ep_square
-                    prev_hash = board.zobrist_hash
-                    # Make null move: swap side, clear ep square, recompute hash
-                    board.side_to_move = "b" if board.side_to_move == "w" else "w"
-                    board.ep_square = None
-                    board.zobrist_hash = compute_hash_from_scratch(board)
+                    # Make null move: swap side, clear ep square (hash updated incrementally)
+                    prev_ep = board.make_null_move()
 
                     R = 2
                     null_score, _ = negamax(d - 1 - R, -beta, -beta + 1, ply + 1)
                     score_nm = -null_score
 
                     # Undo null move
-                    board.side_to_move = prev_stm
-                    board.ep_square = prev_ep
-                    board.zobrist_hash = prev_hash
+                    board.unmake_null_move(prev_ep)
 
                     if score_nm >= beta:
                         return beta, []
@@ -437,25 +402,8 @@ class SearchService:
             legal = legal_precheck
 
             # Move ordering: TT, captures, killers, history
-            # Precompute opponent occupancy to detect captures cheaply
-            if board.side_to_move == "w":
-                occ_opp = (
-                    board.bb[6]
-                    | board.bb[7]
-                    | board.bb[8]
-                    | board.bb[9]
-                    | board.bb[10]
-                    | board.bb[11]
-                )
-            else:
-                occ_opp = (
-                    board.bb[0]
-                    | board.bb[1]
-                    | board.bb[2]
-                    | board.bb[3]
-                    | board.bb[4]
-                    | board.bb[5]
-                )
+            # Opponent occupancy (kept by the board) detects captures cheaply
+            occ_opp = board.occ_black if board.side_to_move == "w" else board.occ_white
 
             killer_list = killers.get(ply, [])
 
@@ -477,34 +425,21 @@ class SearchService:
 
             def attacker_piece_index(mv: Move) -> Optional[int]:
                 # Determine which piece is moving from the origin square
-                if board.side_to_move == "w":
-                    own = (WP, WN, WB, WR, WQ, WK)
-                else:
-                    own = (BP, BN, BB, BR, BQ, BK)
-                for p in own:
-                    if (board.bb[p] >> mv.from_sq) & 1:
-                        return p
-                return None
+                return piece_on_square(mv.from_sq)
 
             def victim_piece_index(mv: Move) -> Optional[int]:
-                # Determine captured piece on destination (or EP pawn)
+                # Determine captured piece on destination (or EP pawn); legal moves never
+                # land on an own piece, so any occupant is the victim
                 if board.ep_square is not None and mv.to_sq == board.ep_square:
                     return BP if board.side_to_move == "w" else WP
-                if board.side_to_move == "w":
-                    opp = (BP, BN, BB, BR, BQ, BK)
-                else:
-                    opp = (WP, WN, WB, WR, WQ, WK)
-                for p in opp:
-                    if (board.bb[p] >> mv.to_sq) & 1:
-                        return p
-                return None
+                return piece_on_square(mv.to_sq)
 
             def move_score(mv: Move) -> int:
                 score = 0
                 if is_tt_equal(tt_move, mv):
                     score += 1_000_000
                 # capture detection: destination occupied by opponent or ep target
-                is_capture = ((occ_opp >> mv.to_sq) & 1) == 1 or (
+                is_capture = (occ_opp & SQUARE_BIT[mv.to_sq]) != 0 or (
                     board.ep_square is not None and mv.to_sq == board.ep_square
                 )
                 if is_capture:
@@ -537,7 +472,7 @@ class SearchService:
             for idx, m in enumerate(legal):
                 # Simple SEE gate: prune clearly losing captures at shallow depths
                 # Only consider captures, and only when remaining depth is small
-                is_capture = ((occ_opp >> m.to_sq) & 1) == 1 or (
+                is_capture = (occ_opp & SQUARE_BIT[m.to_sq]) != 0 or (
                     board.ep_square is not None and m.to_sq == board.ep_square
                 )
                 if is_capture and d <= 2:
@@ -605,10 +540,10 @@ class SearchService:
                     alpha = score
                 if alpha >= beta:
                     # Fail-high cutoff
-                    store(d, best_score, alpha_orig, beta, best_move)
+                    store(d, best_score, alpha_orig, beta, best_move, ply)
                     # Update killers/history for quiet cutoffs
                     # Re-detect capture on this move in current position context
-                    is_capture = ((occ_opp >> m.to_sq) & 1) == 1 or (
+                    is_capture = (occ_opp & SQUARE_BIT[m.to_sq]) != 0 or (
                         board.ep_square is not None and m.to_sq == board.ep_square
                     )
                     if not is_capture:
@@ -622,7 +557,7 @@ class SearchService:
                         history[key] = history.get(key, 0) + d * d
                     return best_score, best_line
 
-            store(d, best_score, alpha_orig, beta, best_move)
+            store(d, best_score, alpha_orig, beta, best_move, ply)
             return best_score, best_line
 
         def qsearch(alpha: int, beta: int, ply: int) -> Tuple[int, List[Move]]:
@@ -640,49 +575,21 @@ class SearchService:
             if rep_counts.get(board.zobrist_hash, 0) >= 3:
                 return 0, []
 
-            # Immediate terminal states (no legal moves)
-            legal = board.generate_legal_moves()
-            if not legal:
-                if board.in_check():
+            # In check every evasion is searched; otherwise only captures, generated
+            # directly so quiet moves are never built. Terminal states are still detected.
+            if board.in_check():
+                captures = board.generate_legal_moves()
+                if not captures:
                     return -MATE_SCORE + ply, []
-                return 0, []
-
-            # If not in check, we can consider stand-pat cutoff
-            if not board.in_check():
+            else:
+                captures = board.generate_legal_captures()
+                if not captures and not board.has_legal_moves():
+                    return 0, []
                 if stand_pat >= beta:
                     return stand_pat, []
                 if stand_pat > alpha:
                     alpha = stand_pat
 
-            # Precompute opponent occupancy to filter captures
-            if board.side_to_move == "w":
-                occ_opp = (
-                    board.bb[6]
-                    | board.bb[7]
-                    | board.bb[8]
-                    | board.bb[9]
-                    | board.bb[10]
-                    | board.bb[11]
-                )
-            else:
-                occ_opp = (
-                    board.bb[0]
-                    | board.bb[1]
-                    | board.bb[2]
-                    | board.bb[3]
-                    | board.bb[4]
-                    | board.bb[5]
-                )
-
-            # Filter to captures (and en passant)
-            captures: List[Move] = []
-            for m in legal:
-                is_capture = ((occ_opp >> m.to_sq) & 1) == 1 or (
-                    board.ep_square is not None and m.to_sq == board.ep_square
-                )
-                if is_capture or board.in_check():
-                    captures.append(m)
-
             if not captures:
                 return alpha, []
 
@@ -690,26 +597,12 @@ class SearchService:
             piece_vals = [100, 320, 330, 500, 900, 20000] * 2
 
             def attacker_piece_index(mv: Move) -> Optional[int]:
-                if board.side_to_move == "w":
-                    own = (WP, WN, WB, WR, WQ, WK)
-                else:
-                    own = (BP, BN, BB, BR, BQ, BK)
-                for p in own:
-                    if (board.bb[p] >> mv.from_sq) & 1:
-                        return p
-                return None
+                return piece_on_square(mv.from_sq)
 
             def victim_piece_index(mv: Move) -> Optional[int]:
                 if board.ep_square is not None and mv.to_sq == board.ep_square:
                     return BP if board.side_to_move == "w" else WP
-                if board.side_to_move == "w":
-                    opp = (BP, BN, BB, BR, BQ, BK)
-                else:
-                    opp = (WP, WN, WB, WR, WQ, WK)
-                for p in opp:
-                    if (board.bb[p] >> mv.to_sq) & 1:
-                        return p
-                return None
+                return piece_on_square(mv.to_sq)
 
             def cap_score(mv: Move) -> int:
                 att = attacker_piece_index(mv)
@@ -759,7 +652,7 @@ class SearchService:
         BASE_WINDOW = 50  # aspiration window in centipawns
 
         def in_mate_window(sc: int) -> bool:
-            return abs(sc) >= MATE_SCORE - 512
+            return abs(sc) >= MATE_BOUND
 
         for d in range(1, max(1, depth) + 1):
             generation += 1
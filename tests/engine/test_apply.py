@@ -46,3 +46,8 @@ def test_apply_handles_castling_rook_motion() -> None:
     assert ((b2.bb[WR] >> h1) & 1) == 0
     # Original unchanged
     assert ((b.bb[WR] >> h1) & 1) == 1
+    # The clone's derived state matches a fresh parse of its FEN
+    fresh = Board.from_fen(b2.to_fen())
+    assert b2.zobrist_hash == fresh.zobrist_hash
+    assert b2.mailbox == fresh.mailbox
+    assert b2.mailbox is not b.mailbox
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from src.engine.board import BP, WP, Board
+from src.engine.move import Move
+
+
+def _is_capture(b: Board, m: Move) -> bool:
+    opp = b.occ_black if b.side_to_move == "w" else b.occ_white
+    if (opp >> m.to_sq) & 1:
+        return True
+    return m.to_sq == b.ep_square and b.mailbox[m.from_sq] in (WP, BP)
+
+
+def test_generate_legal_captures_matches_filtered_legal_moves() -> None:
+    fens = [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        # En passant available for white
+        "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1",
+        # A knight can also reach the ep square, but only the pawn captures there
+        "4k3/8/8/3pPN2/8/8/8/4K3 w - d6 0 1",
+        # Black to move, capture-promotions on b1
+        "4k3/8/8/8/8/8/p7/1N2K3 b - - 0 1",
+    ]
+    for fen in fens:
+        b = Board.from_fen(fen)
+        expected = {m.to_uci() for m in b.generate_legal_moves() if _is_capture(b, m)}
+        assert {m.to_uci() for m in b.generate_legal_captures()} == expected
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from src.engine.board import Board, WP, BP
 from src.engine.move import Move, str_to_square
 
@@ -11,12 +13,11 @@ def test_white_en_passant_generation_and_apply() -> None:
     moves = {m.to_uci() for m in b.generate_legal_moves()}
     assert "d5e6" in moves
 
-    # Simulate application on bitboards: white pawn moves to e6, black pawn on e5 removed
+    # Apply on a copy: white pawn moves to e6, black pawn on e5 removed
     mv = Move(b"d5".decode() if False else 27, 28)  # placeholder to keep type; not used
     # Find the actual Move object
     mv = next(m for m in b.generate_legal_moves() if m.to_uci() == "d5e6")
-    new_bb = b._apply_pseudo_to_bb(mv)
-    assert new_bb is not None
+    new_bb = b.apply(mv).bb
     e6 = str_to_square("e6")
     d5 = str_to_square("d5")
     e5 = str_to_square("e5")
@@ -33,11 +34,36 @@ def test_black_en_passant_generation_and_apply() -> None:
     assert "d4e3" in moves
 
     mv = next(m for m in b.generate_legal_moves() if m.to_uci() == "d4e3")
-    new_bb = b._apply_pseudo_to_bb(mv)
-    assert new_bb is not None
+    new_bb = b.apply(mv).bb
     d4 = str_to_square("d4")
     e3 = str_to_square("e3")
     e4 = str_to_square("e4")
     assert (new_bb[BP] >> e3) & 1
     assert ((new_bb[BP] >> d4) & 1) == 0
     assert ((new_bb[WP] >> e4) & 1) == 0
+
+
+def test_en_passant_legality_edge_cases() -> None:
+    # Capturing would clear both pawns off the king's rank and expose it to the rook
+    b = Board.from_fen("8/8/8/K1pP3r/8/8/8/7k w - c6 0 1")
+    assert "d5c6" not in {m.to_uci() for m in b.generate_legal_moves()}
+    # Removing the captured pawn opens the long diagonal from the bishop to the king
+    b = Board.from_fen("k7/8/8/8/3pP3/8/8/4K2B b - e3 0 1")
+    assert "d4e3" not in {m.to_uci() for m in b.generate_legal_moves()}
+    # Taking the pawn that gives check is a legal evasion
+    b = Board.from_fen("8/8/8/2k5/3Pp3/8/8/4K3 b - d3 0 1")
+    assert "e4d3" in {m.to_uci() for m in b.generate_legal_moves()}
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        # d5xe6 would XOR a phantom black pawn onto e5
+        "4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1",
+        # Wrong rank for the side to move, and nothing to capture on e4
+        "4k3/8/8/8/8/8/3P4/4K3 w - e3 0 1",
+    ],
+)
+def test_en_passant_square_without_victim_is_rejected(fen: str) -> None:
+    with pytest.raises(ValueError):
+        Board.from_fen(fen)
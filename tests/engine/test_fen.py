@@ -44,3 +44,34 @@ def test_round_trip_various_positions(fen: str) -> None:  # type: ignore[no-rede
 def test_invalid_fen_raises(fen: str) -> None:
     with pytest.raises(ValueError):
         Board.from_fen(fen)
+
+
+@pytest.mark.parametrize(
+    ("fen", "message"),
+    [
+        ("9/8/8/8/8/8/8/8 w - - 0 1", "invalid empty count in FEN rank"),
+        ("08/8/8/8/8/8/8/8 w - - 0 1", "invalid empty count in FEN rank"),
+        ("7X/8/8/8/8/8/8/8 w - - 0 1", "invalid piece in FEN: 'X'"),
+        ("8/8/8/8/8/8/8/7 w - - 0 1", "rank does not sum to 8 squares in FEN"),
+    ],
+)
+def test_invalid_placement_messages(fen: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        Board.from_fen(fen)
+
+
+@pytest.mark.parametrize(
+    ("fen", "message"),
+    [
+        # No black pawn behind the ep square
+        ("4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1", "no pawn to capture en passant"),
+        # Rank 3 target with white to move
+        ("4k3/8/8/8/8/8/3P4/4K3 w - e3 0 1", "invalid en passant square rank"),
+        ("4k3/8/8/8/3pP3/8/8/4K3 w - e3 0 1", "invalid en passant square rank"),
+        # Target square occupied
+        ("4k3/8/4n3/3Pp3/8/8/8/4K3 w - e6 0 1", "en passant square is occupied"),
+    ],
+)
+def test_invalid_en_passant_square(fen: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        Board.from_fen(fen)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+
+from src.engine.board import Board, bishop_attacks, rook_attacks
+from src.engine.move import str_to_square
+
+
+def test_slider_attack_through_empty_ray() -> None:
+    # Black rook a8 attacks along rank 8 and the a-file; bishop h8 covers the long diagonal
+    b = Board.from_fen("r6b/8/8/8/8/8/8/K6k w - - 0 1")
+    assert b._is_attacked(str_to_square("e8"), by_white=False)
+    assert b._is_attacked(str_to_square("a2"), by_white=False)
+    assert b._is_attacked(str_to_square("d4"), by_white=False)
+    assert not b._is_attacked(str_to_square("c5"), by_white=False)
+
+
+def test_slider_attack_blocked_by_piece() -> None:
+    # White pawn on a4 shields a1..a3 from the black rook on a8
+    b = Board.from_fen("r6k/8/8/8/P7/8/8/7K w - - 0 1")
+    assert b._is_attacked(str_to_square("a5"), by_white=False)
+    assert not b._is_attacked(str_to_square("a3"), by_white=False)
+
+
+def test_no_sliders_on_rays_short_circuits() -> None:
+    # Only kings and a far-away knight: no slider can reach any square
+    b = Board.from_fen("7k/8/8/8/8/8/8/N6K w - - 0 1")
+    assert b._is_attacked(str_to_square("b3"), by_white=True)
+    assert not b._is_attacked(str_to_square("e4"), by_white=True)
+    assert not b._is_attacked(str_to_square("e4"), by_white=False)
+
+
+def test_pawn_attacks_do_not_wrap_across_files() -> None:
+    # Pawns on the a/h files attack only one diagonal; the shifted set must not wrap
+    b = Board.from_fen("4k3/p6p/8/8/8/8/P6P/4K3 w - - 0 1")
+    assert b._is_attacked(str_to_square("b3"), by_white=True)
+    assert b._is_attacked(str_to_square("g3"), by_white=True)
+    assert not b._is_attacked(str_to_square("h4"), by_white=True)
+    assert not b._is_attacked(str_to_square("a2"), by_white=True)
+    assert b._is_attacked(str_to_square("b6"), by_white=False)
+    assert b._is_attacked(str_to_square("g6"), by_white=False)
+    assert not b._is_attacked(str_to_square("a5"), by_white=False)
+    assert not b._is_attacked(str_to_square("h7"), by_white=False)
+
+
+def test_attack_bitmap_matches_per_square_queries() -> None:
+    fens = [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    ]
+    for fen in fens:
+        b = Board.from_fen(fen)
+        for by_white in (True, False):
+            attacked = b._attack_bitmap(by_white=by_white)
+            for sq in range(64):
+                assert bool((attacked >> sq) & 1) == b._is_attacked(sq, by_white=by_white)
+
+
+def _walk(sq: int, occ: int, dirs: tuple) -> int:
+    attacks = 0
+    for df, dr in dirs:
+        f, r = sq % 8 + df, sq // 8 + dr
+        while 0 <= f < 8 and 0 <= r < 8:
+            attacks |= 1 << (r * 8 + f)
+            if (occ >> (r * 8 + f)) & 1:
+                break
+            f, r = f + df, r + dr
+    return attacks
+
+
+def test_slider_lookups_match_ray_walk() -> None:
+    rng = random.Random(7)
+    for _ in range(500):
+        sq = rng.randrange(64)
+        occ = rng.getrandbits(64) & rng.getrandbits(64)
+        assert bishop_attacks(sq, occ) == _walk(sq, occ, ((1, 1), (1, -1), (-1, 1), (-1, -1)))
+        assert rook_attacks(sq, occ) == _walk(sq, occ, ((1, 0), (-1, 0), (0, 1), (0, -1)))
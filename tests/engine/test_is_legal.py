@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from src.engine.board import Board
+from src.engine.game import Game
+from src.engine.move import Move, parse_uci
+
+CANDIDATES = [Move(f, t, p) for f in range(64) for t in range(64) for p in (None, "q", "n")]
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "8/8/8/K1pP3r/8/8/8/7k w - c6 0 1",
+    ],
+)
+def test_is_legal_agrees_with_generator(fen: str) -> None:
+    b = Board.from_fen(fen)
+    legal = set(b.generate_legal_moves())
+    assert {m for m in CANDIDATES if b.is_legal(m)} == legal
+
+
+def test_is_legal_rejects_bad_promotion_and_castling_through_check() -> None:
+    b = Board.from_fen("4k3/P7/8/8/8/8/8/R3K3 w Q - 0 1")
+    assert not b.is_legal(parse_uci("a7a8"))
+    assert b.is_legal(parse_uci("a7a8q"))
+    assert b.is_legal(parse_uci("e1c1"))
+    # In check from the h1 rook: castling is illegal even with rights and empty squares
+    b = Board.from_fen("4k3/P7/8/8/8/8/8/R3K2r w Q - 0 1")
+    assert not b.is_legal(parse_uci("e1c1"))
+
+
+@pytest.mark.parametrize(
+    "fen, expected",
+    [
+        ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", False),  # stalemate
+        ("6rk/5Npp/8/8/8/8/8/6K1 b - - 0 1", False),  # smothered mate
+        ("k7/8/1Q6/8/8/8/8/6K1 b - - 0 1", False),  # stalemate, king boxed in
+        ("k7/8/2Q5/8/8/8/p7/6K1 b - - 0 1", True),  # no king step, but the pawn can move
+    ],
+)
+def test_has_legal_moves_matches_generation(fen: str, expected: bool) -> None:
+    b = Board.from_fen(fen)
+    assert b.has_legal_moves() is expected
+    assert bool(b.generate_legal_moves()) is expected
+
+
+@pytest.mark.parametrize(
+    "move",
+    [Move(52, 60, "x"), Move(52, 60, "k"), Move(-12, 60, "q"), Move(52, 64), Move(7, -1)],
+)
+def test_apply_rejects_unknown_promotion_and_off_board_squares(move: Move) -> None:
+    fen = "8/4P3/8/8/8/8/k7/7K w - - 0 1"
+    assert not Board.from_fen(fen).is_legal(move)
+    with pytest.raises(ValueError):
+        Board.from_fen(fen).apply(move)
+    game = Game.from_fen(fen)
+    with pytest.raises(ValueError):
+        game.apply_move(move)
+    assert game.to_fen() == fen
@@ -18,3 +18,17 @@ def test_make_unmake_restores_position() -> None:
     b.unmake_move(mv)
     assert b.to_fen() == STARTPOS_FEN
     assert compute_hash_from_scratch(b) == h_before
+
+
+def test_legal_move_cache_survives_reordering_and_make_unmake() -> None:
+    b = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    first = b.generate_legal_moves()
+    expected = [m.to_uci() for m in first]
+    first.reverse()  # callers may reorder their copy
+    assert [m.to_uci() for m in b.generate_legal_moves()] == expected
+    mv = b.generate_legal_moves()[0]
+    b.make_move(mv)
+    reply = {m.to_uci() for m in b.generate_legal_moves()}
+    assert reply != set(expected)
+    b.unmake_move(mv)
+    assert [m.to_uci() for m in b.generate_legal_moves()] == expected
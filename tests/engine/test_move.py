@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from src.engine.board import Board
+from src.engine.move import MOVES, PROMOTION_MOVES, Move, parse_uci, square_to_str, str_to_square
+
+
+def test_generated_moves_are_interned_and_compare_structurally() -> None:
+    b = Board.from_fen("n1n1k3/PPPP4/8/8/8/8/8/4K3 w - - 0 1")
+    moves = b.generate_legal_moves()
+    for mv in moves:
+        if mv.promotion:
+            assert mv in PROMOTION_MOVES[mv.from_sq << 6 | mv.to_sq]
+        else:
+            assert mv is MOVES[mv.from_sq][mv.to_sq]
+    # Freshly built moves still match the shared instances by value
+    assert parse_uci("b7a8q") in moves
+    assert Move(4, 5) == MOVES[4][5]
+
+
+def test_square_names_round_trip_and_reject_bad_input() -> None:
+    for sq in range(64):
+        assert str_to_square(square_to_str(sq)) == sq
+    assert square_to_str(0) == "a1" and square_to_str(63) == "h8"
+    for bad in ("i1", "a9", "a0", "A1", "e", "e10"):
+        with pytest.raises(ValueError):
+            str_to_square(bad)
+    for bad in (-1, 64):
+        with pytest.raises(ValueError):
+            square_to_str(bad)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from src.engine.board import Board, STARTPOS_FEN
 from src.engine.perft import perft
 
@@ -17,3 +19,25 @@ def test_perft_kiwipete_depth_2() -> None:
     b = Board.from_fen(fen)
     assert perft(b, 1) == 48
     assert perft(b, 2) == 2039
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        STARTPOS_FEN,
+        # Kiwipete: castling, en passant and promotions
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        # Position 3 and 4 variants: pinned pawns, en passant, promotions and checks
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    ],
+)
+def test_count_legal_moves_matches_generation(fen: str) -> None:
+    b = Board.from_fen(fen)
+    assert b.count_legal_moves() == len(b.generate_legal_moves())
+    for m in b.generate_legal_moves():
+        b.make_move(m)
+        expected = len(b.generate_legal_moves())
+        b._cached_moves = None  # count from the board, not the cached list
+        assert b.count_legal_moves() == expected, (fen, m.to_uci())
+        b.unmake_move(m)
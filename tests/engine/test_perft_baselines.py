@@ -12,6 +12,7 @@ from src.engine.perft import perft
         (1, 20),
         (2, 400),
         (3, 8902),
+        (4, 197281),  # first depth with transpositions (reused subtree counts)
     ],
 )
 def test_startpos_perft(depth: int, expected: int) -> None:
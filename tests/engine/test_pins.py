@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from src.engine.board import BETWEEN, LINE, Board
+from src.engine.move import str_to_square
+
+
+def test_between_and_line_tables() -> None:
+    a1, d4, h8, b3 = (str_to_square(s) for s in ("a1", "d4", "h8", "b3"))
+    assert BETWEEN[a1][d4] == (1 << str_to_square("b2")) | (1 << str_to_square("c3"))
+    assert LINE[a1][d4] == LINE[d4][h8]
+    assert (LINE[a1][d4] >> h8) & 1
+    assert BETWEEN[a1][b3] == 0 and LINE[a1][b3] == 0
+
+
+def test_pinned_mask_and_pinned_piece_moves() -> None:
+    # White knight e2 is pinned by the rook on e8; the bishop d2 is pinned by the bishop on a5
+    b = Board.from_fen("4r2k/8/8/b7/8/8/3BN3/4K3 w - - 0 1")
+    e1 = str_to_square("e1")
+    pinned = b._pinned_mask(e1, True)
+    assert pinned == (1 << str_to_square("e2")) | (1 << str_to_square("d2"))
+
+    ucis = {m.to_uci() for m in b.generate_legal_moves()}
+    assert not any(u.startswith("e2") for u in ucis)
+    # The pinned bishop may only slide along the pin line, including capturing the pinner
+    assert {u for u in ucis if u.startswith("d2")} == {"d2c3", "d2b4", "d2a5"}
+
+
+def test_check_evasions_block_capture_or_move_king() -> None:
+    # Black rook e8 checks the white king on e1; the knight may block on e2/e4 only
+    b = Board.from_fen("4r2k/8/8/8/8/2N5/8/4K3 w - - 0 1")
+    assert b._checkers(str_to_square("e1"), True) == 1 << str_to_square("e8")
+    ucis = {m.to_uci() for m in b.generate_legal_moves()}
+    assert {u for u in ucis if u.startswith("c3")} == {"c3e2", "c3e4"}
+
+    # Double check (rook e8 and knight d3): only king moves remain
+    b = Board.from_fen("4r2k/8/8/8/8/2Nn4/8/4K3 w - - 0 1")
+    assert all(m.from_sq == str_to_square("e1") for m in b.generate_legal_moves())
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from src.engine.board import Board
+from src.engine.board import (
+    CASTLE_BK,
+    CASTLE_BQ,
+    CASTLE_WK,
+    CASTLE_WQ,
+    CASTLING_KEEP,
+    WR,
+    Board,
+)
 from src.engine.move import Move
 
 
@@ -50,3 +58,96 @@ def test_castling_rights_update_on_king_and_rook_moves_and_captures() -> None:
     wking_move = _find(b, "e1e2")
     b.make_move(wking_move)
     assert ("K" not in b.castling) and ("Q" not in b.castling)
+
+
+def test_castling_rights_mask_and_string_view_agree() -> None:
+    b = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1")
+    assert b.castling_rights == CASTLE_WK | CASTLE_BQ
+    assert b.castling == "Kq"
+
+    b.castling = "Qk"
+    assert b.castling_rights == CASTLE_WQ | CASTLE_BK
+    assert b.to_fen().split()[2] == "Qk"
+
+    # Unmake restores the exact mask
+    b.make_move(_find(b, "e1e2"))
+    assert b.castling == "k"
+    b.unmake_move(Move(4, 12))
+    assert b.castling_rights == CASTLE_WQ | CASTLE_BK
+
+
+def test_incremental_occupancy_and_mailbox_match_bitboards() -> None:
+    # Kiwipete covers captures, castling, en passant and promotions within two plies
+    b = Board.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+
+    def check(board: Board) -> None:
+        white = sum(board.bb[p] for p in range(6))
+        black = sum(board.bb[p] for p in range(6, 12))
+        assert board.occ_white == white
+        assert board.occ_black == black
+        assert board.occ_all == white | black
+        for sq in range(64):
+            owners = [p for p in range(12) if (board.bb[p] >> sq) & 1]
+            assert board.mailbox[sq] == (owners[0] if owners else -1)
+
+    for mv in b.generate_legal_moves():
+        b.make_move(mv)
+        check(b)
+        for reply in b.generate_legal_moves():
+            b.make_move(reply)
+            check(b)
+            b.unmake_move(reply)
+            check(b)
+        b.unmake_move(mv)
+        check(b)
+
+
+def test_board_uses_slots() -> None:
+    b = Board.startpos()
+    assert not hasattr(b, "__dict__")
+    b.castling = "Kq"  # property setter still works on a slotted class
+    assert b.castling_rights == CASTLE_WK | CASTLE_BQ
+
+
+def test_castling_keep_masks_and_rook_capture() -> None:
+    assert CASTLING_KEEP[4] == CASTLE_BK | CASTLE_BQ
+    assert CASTLING_KEEP[63] == CASTLE_WK | CASTLE_WQ | CASTLE_BQ
+    assert CASTLING_KEEP[27] == 0xF
+    # Rook takes rook on h8: white loses K (rook left h1), black loses k (rook captured)
+    b = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    b.make_move(_find(b, "h1h8"))
+    assert b.castling == "Qq"
+
+
+def test_move_cache_follows_direct_state_edits() -> None:
+    # Direct assignments bypass the Zobrist hash; cached move lists must not survive them
+    b = Board.startpos()
+    assert len(b.generate_legal_moves()) == 20
+    b.side_to_move = "b"
+    moves = b.generate_legal_moves()
+    assert all(m.from_sq >= 48 for m in moves) and len(moves) == 20
+    assert b.count_legal_moves() == 20 and b.has_legal_moves()
+
+    b = Board.from_fen("4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1")
+    assert "d5e6" in {m.to_uci() for m in b.generate_legal_moves()}
+    b.ep_square = None
+    assert "d5e6" not in {m.to_uci() for m in b.generate_legal_moves()}
+
+    b = Board.from_fen("4k3/8/8/8/8/8/8/R3K2R w KQ - 0 1")
+    assert b.count_legal_moves() == len(b.generate_legal_moves()) == 26
+    b.castling_rights = 0
+    assert b.count_legal_moves() == len(b.generate_legal_moves()) == 24
+
+    # Bitboard edits follow the documented `_refresh_occupancy()` contract
+    b.bb[WR] = 0
+    b._refresh_occupancy()
+    assert len(b.generate_legal_moves()) == 5
+
+
+def test_board_equality_ignores_the_move_cache() -> None:
+    a = Board.startpos()
+    b = Board.startpos()
+    a.generate_legal_moves()
+    assert a == b
+    b.side_to_move = "b"
+    assert a != b
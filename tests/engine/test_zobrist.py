@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from src.engine.board import Board, STARTPOS_FEN
-from src.engine.zobrist import compute_hash_from_scratch
+from src.engine.zobrist import ZOBRIST_CASTLING, compute_hash_from_scratch
 
 
 def test_zobrist_deterministic_same_position() -> None:
@@ -40,3 +40,23 @@ def test_zobrist_en_passant_affects_hash() -> None:
     b.ep_square = None
     h_no_ep = compute_hash_from_scratch(b)
     assert h_ep != h_no_ep
+
+
+def test_null_move_hash_matches_full_recompute() -> None:
+    fen_with_ep = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+    b = Board.from_fen(fen_with_ep)
+    h_before = b.zobrist_hash
+    prev_ep = b.make_null_move()
+    assert b.side_to_move == "w" and b.ep_square is None
+    assert b.zobrist_hash == compute_hash_from_scratch(b)
+    b.unmake_null_move(prev_ep)
+    assert b.to_fen() == fen_with_ep
+    assert b.zobrist_hash == h_before
+
+
+def test_castling_key_transitions_are_single_lookups() -> None:
+    # make_move toggles rights with ZOBRIST_CASTLING[prev ^ new]; that must equal
+    # removing the old rights' key and adding the new one
+    for prev in range(16):
+        for new in range(16):
+            assert ZOBRIST_CASTLING[prev ^ new] == ZOBRIST_CASTLING[prev] ^ ZOBRIST_CASTLING[new]
@@ -14,3 +14,13 @@ def test_white_knight_outpost_supported_and_not_attacked_scores_higher() -> None
     sc_o = evaluate(g_o.board)
     sc_a = evaluate(g_a.board)
     assert sc_o > sc_a
+
+
+def test_black_knight_outpost_on_the_edge_file() -> None:
+    # Black knight on a4 supported by b5; a white pawn on b2 would attack a3, not a4, so
+    # the only way to break the outpost is a pawn on b3
+    fen_outpost = "4k3/8/8/1p6/n7/8/1P6/4K3 w - - 0 1"
+    fen_attacked = "4k3/8/8/1p6/n7/1P6/8/4K3 w - - 0 1"
+    sc_o = evaluate(Game.from_fen(fen_outpost).board)
+    sc_a = evaluate(Game.from_fen(fen_attacked).board)
+    assert sc_o < sc_a
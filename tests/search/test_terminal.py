@@ -32,3 +32,28 @@ def test_checkmate_root_reports_mate() -> None:
     assert res.mate_in is not None and res.mate_in <= 0
     # When mate is reported, cp score should be None
     assert res.score_cp is None
+
+
+def test_mate_in_one_is_not_replaced_by_a_cached_deeper_mate() -> None:
+    # White mates with Qe8# or Qg7#. A mate score cached by the TT at one ply must not be
+    # reused unadjusted at another, or a slower line (e.g. f7f6) is reported as mate in 1.
+    fen = "7k/5Q2/6K1/8/8/8/8/8 w - - 0 1"
+    game = Game.from_fen(fen)
+
+    res = SearchService().search(game, depth=3)
+    assert res.mate_in == 1
+    assert res.best_move is not None
+    # Both mates score alike; which one is found first follows move generation order
+    assert res.best_move.to_uci() in ("f7e8", "f7g7")
+    assert [m.to_uci() for m in res.pv] == [res.best_move.to_uci()]
+    game.apply_move(res.best_move)
+    assert game.checkmate() is True
+
+
+def test_smothered_mate_is_found_whatever_the_knight_move_order() -> None:
+    # Knight targets come out in ascending square order; the unique mate must still win
+    game = Game.from_fen("6rk/6pp/8/6N1/8/8/8/6K1 w - - 0 1")
+
+    res = SearchService().search(game, depth=3)
+    assert res.mate_in == 1
+    assert res.best_move is not None and res.best_move.to_uci() == "g5f7"